@@ -0,0 +1,835 @@
+"""
+Precompiled templates for the SOP reference embed designs
+
+Each design is a page template plus one item template per reference kind
+(SOP, appendix). At import the three are parsed and compiled into a single
+Python function per design that joins pre-built literal text (the static
+HTML/CSS/JS) with the row's CSV fields, so rendering a row never re-scans or
+re-formats the static parts. Placeholders are written {{field}}.
+
+Output modes are applied to the template text before compiling, so they cost
+nothing per row either: minify squeezes the HTML, CSS and JS, and a shared
+asset base URL moves each design's stylesheet into one content-hashed file
+that every embed of the design links to.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+STYLE_BLOCK = re.compile(r"<style>(.*?)</style>", re.S)
+EMBEDDED_BLOCK = re.compile(r"(<style>.*?</style>|<script>.*?</script>)", re.S)
+TAG = re.compile(r"\s*(<[^>]*>)\s*")
+QUOTES = "'\"`"
+CSS_PUNCTUATION = "{}:;,>"
+JS_PUNCTUATION = "{}();,=:<>!&|?"
+
+
+class CompiledTemplate:
+    """A template parsed once into literal text and field slots"""
+
+    def __init__(self, text, prefix="L"):
+        """
+        Parse a template
+
+        Args:
+            text: Template text with {{field}} placeholders
+            prefix: Name prefix for this template's literals in generated code
+        """
+        parts = PLACEHOLDER.split(text)
+        self.literals = tuple(parts[0::2])
+        self.fields = tuple(parts[1::2])
+        self.namespace = {f"{prefix}{i}": literal for i, literal in enumerate(self.literals)}
+        self._names = tuple(self.namespace)
+
+    def expression(self, sources):
+        """Python expression joining the literals with each field's source expression"""
+        pieces = []
+        for i, name in enumerate(self._names):
+            if self.literals[i]:
+                pieces.append(name)
+            if i < len(self.fields):
+                pieces.append(sources[self.fields[i]])
+        return f"''.join(({', '.join(pieces)},))"
+
+
+def squeeze(code, punctuation):
+    """
+    Collapse whitespace in code, dropping it next to punctuation
+
+    Quoted strings are copied as they are. Meant for the embed templates'
+    own CSS and JS, which end every statement with a semicolon and use no
+    comments; it is not a general-purpose minifier.
+    """
+    out = []
+    space = False
+    i = 0
+    while i < len(code):
+        ch = code[i]
+        if ch.isspace():
+            space = True
+            i += 1
+            continue
+        end = i + 1
+        if ch in QUOTES:
+            while end < len(code) and code[end] != ch:
+                end += 2 if code[end] == "\\" else 1
+            end += 1
+        if space and out and ch not in punctuation and out[-1][-1] not in punctuation:
+            out.append(" ")
+        space = False
+        out.append(code[i:end])
+        i = end
+    return "".join(out)
+
+
+def minify_css(css):
+    """Minified stylesheet text"""
+    return squeeze(css, CSS_PUNCTUATION).replace(";}", "}")
+
+
+def minify_js(js):
+    """Minified script text"""
+    return squeeze(js, JS_PUNCTUATION)
+
+
+def minify_html(text):
+    """Minify a template: style and script blocks squeezed, whitespace around tags dropped"""
+    pieces = EMBEDDED_BLOCK.split(text)
+    for i, piece in enumerate(pieces):
+        if i % 2:
+            if piece.startswith("<style>"):
+                pieces[i] = f"<style>{minify_css(piece[7:-8])}</style>"
+            else:
+                pieces[i] = f"<script>{minify_js(piece[8:-9])}</script>"
+        else:
+            pieces[i] = TAG.sub(r"\1", re.sub(r"\s+", " ", piece))
+    return "".join(pieces)
+
+
+def compile_design(page, sop_item, appendix_item, separator="\n"):
+    """
+    Compile a design's templates into one render(ref_data) function
+
+    The generated function reads fields straight from the CSV row, so a
+    row costs one call and one join per template. Items are joined with
+    separator.
+    """
+    page = CompiledTemplate(page, "P")
+    sop_item = CompiledTemplate(sop_item, "S")
+    appendix_item = CompiledTemplate(appendix_item, "A")
+
+    row_fields = {field: f"ref_data[{column!r}]" for field, column in ROW_FIELDS.items()}
+    source = "\n".join([
+        "def render(ref_data):",
+        "    items = []",
+        "    if ref_data['SOP Section']:",
+        f"        items.append({sop_item.expression(row_fields)})",
+        "    if ref_data['Appendix Section']:",
+        f"        items.append({appendix_item.expression(row_fields)})",
+        "    count = len(items)",
+        "    return " + page.expression({
+            **row_fields,
+            "items": f"{separator!r}.join(items)",
+            "ref_count": "str(count)",
+            "ref_plural": "('s' if count > 1 else '')",
+        }),
+    ])
+    namespace = {**page.namespace, **sop_item.namespace, **appendix_item.namespace}
+    exec(compile(source, "<embed design>", "exec"), namespace)
+    return namespace["render"]
+
+
+# Template fields filled from CSV columns
+ROW_FIELDS = {
+    "sop_section": 'SOP Section',
+    "sop_pages": 'SOP Page Numbers',
+    "appendix_section": 'Appendix Section',
+    "appendix_pages": 'Appendix Page Numbers',
+    "description": 'Reference Description',
+    "trigger_text": 'Reference Trigger Text',
+}
+
+
+# Design A: Inline Link with Modal
+DESIGN_A_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SOP Reference</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+        }
+
+        .sop-reference-compact {
+            margin-top: 20px;
+            padding: 12px 16px;
+            background: linear-gradient(135deg, #e8f4f8 0%, #f0f8fc 100%);
+            border-left: 4px solid #0066cc;
+            border-radius: 6px;
+        }
+
+        .sop-reference-link {
+            display: inline-flex;
+            align-items: center;
+            gap: 8px;
+            color: #0066cc;
+            text-decoration: none;
+            font-weight: 600;
+            font-size: 14px;
+            cursor: pointer;
+            transition: all 0.2s ease;
+            padding: 4px 8px;
+            border-radius: 4px;
+        }
+
+        .sop-reference-link:hover {
+            background: rgba(0, 102, 204, 0.1);
+            color: #004999;
+        }
+
+        .sop-reference-link svg {
+            width: 18px;
+            height: 18px;
+        }
+
+        .modal-overlay {
+            display: none;
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(0, 0, 0, 0.6);
+            z-index: 1000;
+            animation: fadeIn 0.2s ease;
+            align-items: center;
+            justify-content: center;
+        }
+
+        .modal-overlay.active {
+            display: flex;
+        }
+
+        .modal-content {
+            background: white;
+            border-radius: 12px;
+            width: 90%;
+            max-width: 550px;
+            max-height: 80vh;
+            overflow-y: auto;
+            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
+            animation: slideUp 0.3s ease;
+        }
+
+        .modal-header {
+            background: linear-gradient(135deg, #1e3a5f 0%, #2a5082 100%);
+            color: white;
+            padding: 20px 24px;
+            border-radius: 12px 12px 0 0;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }
+
+        .modal-header h3 {
+            font-size: 18px;
+            font-weight: 600;
+        }
+
+        .close-btn {
+            background: rgba(255, 255, 255, 0.2);
+            border: none;
+            color: white;
+            width: 32px;
+            height: 32px;
+            border-radius: 50%;
+            cursor: pointer;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            transition: all 0.2s ease;
+            font-size: 20px;
+        }
+
+        .close-btn:hover {
+            background: rgba(255, 255, 255, 0.3);
+            transform: rotate(90deg);
+        }
+
+        .modal-body {
+            padding: 24px;
+        }
+
+        .reference-item {
+            background: #f8f9fa;
+            border-left: 4px solid #0066cc;
+            padding: 16px;
+            border-radius: 6px;
+            margin-bottom: 12px;
+        }
+
+        .reference-item:last-child {
+            margin-bottom: 0;
+        }
+
+        .reference-label {
+            color: #0066cc;
+            font-weight: 600;
+            font-size: 12px;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-bottom: 6px;
+        }
+
+        .reference-location {
+            color: #1e3a5f;
+            font-size: 16px;
+            font-weight: 600;
+            margin-bottom: 6px;
+        }
+
+        .reference-description {
+            color: #555;
+            font-size: 14px;
+            line-height: 1.5;
+        }
+
+        @keyframes fadeIn {
+            from { opacity: 0; }
+            to { opacity: 1; }
+        }
+
+        @keyframes slideUp {
+            from {
+                opacity: 0;
+                transform: translateY(30px);
+            }
+            to {
+                opacity: 1;
+                transform: translateY(0);
+            }
+        }
+
+        @media (max-width: 768px) {
+            .modal-content {
+                width: 95%;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="sop-reference-compact">
+        <a class="sop-reference-link" onclick="openModal()">
+            <svg fill="currentColor" viewBox="0 0 20 20">
+                <path d="M9 4.804A7.968 7.968 0 005.5 4c-1.255 0-2.443.29-3.5.804v10A7.969 7.969 0 015.5 14c1.669 0 3.218.51 4.5 1.385A7.962 7.962 0 0114.5 14c1.255 0 2.443.29 3.5.804v-10A7.968 7.968 0 0014.5 4c-1.255 0-2.443.29-3.5.804V12a1 1 0 11-2 0V4.804z"/>
+            </svg>
+            {{trigger_text}}
+        </a>
+    </div>
+
+    <div class="modal-overlay" id="modalOverlay" onclick="closeModalOnOverlay(event)">
+        <div class="modal-content" onclick="event.stopPropagation()">
+            <div class="modal-header">
+                <h3>SOP Reference</h3>
+                <button class="close-btn" onclick="closeModal()">&times;</button>
+            </div>
+            <div class="modal-body">
+                {{items}}
+            </div>
+        </div>
+    </div>
+
+    <script>
+        function openModal() {
+            document.getElementById('modalOverlay').classList.add('active');
+            document.body.style.overflow = 'hidden';
+        }
+
+        function closeModal() {
+            document.getElementById('modalOverlay').classList.remove('active');
+            document.body.style.overflow = 'auto';
+        }
+
+        function closeModalOnOverlay(event) {
+            if (event.target === event.currentTarget) {
+                closeModal();
+            }
+        }
+
+        document.addEventListener('keydown', function(event) {
+            if (event.key === 'Escape') {
+                closeModal();
+            }
+        });
+    </script>
+</body>
+</html>"""
+
+DESIGN_A_SOP_ITEM = """
+                <div class="reference-item">
+                    <div class="reference-label">MPP SOP</div>
+                    <div class="reference-location">{{sop_section}}, Pages {{sop_pages}}</div>
+                    <div class="reference-description">
+                        {{description}}
+                    </div>
+                </div>
+            """
+
+DESIGN_A_APPENDIX_ITEM = """
+                <div class="reference-item">
+                    <div class="reference-label">{{appendix_section}}</div>
+                    <div class="reference-location">Pages {{appendix_pages}}</div>
+                    <div class="reference-description">
+                        {{description}}
+                    </div>
+                </div>
+            """
+
+
+# Design B: Expandable Bar
+DESIGN_B_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SOP Reference</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+        }
+
+        .sop-reference-bar {
+            margin-top: 20px;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+        }
+
+        .sop-reference-header {
+            background: linear-gradient(135deg, #1e3a5f 0%, #2a5082 100%);
+            color: white;
+            padding: 12px 16px;
+            cursor: pointer;
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+            transition: all 0.3s ease;
+        }
+
+        .sop-reference-header:hover {
+            background: linear-gradient(135deg, #2a5082 0%, #1e3a5f 100%);
+        }
+
+        .header-left {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }
+
+        .header-icon {
+            width: 20px;
+            height: 20px;
+        }
+
+        .header-text {
+            font-weight: 600;
+            font-size: 14px;
+        }
+
+        .header-badge {
+            background: rgba(255, 255, 255, 0.2);
+            padding: 2px 8px;
+            border-radius: 12px;
+            font-size: 11px;
+            font-weight: 600;
+            margin-left: 8px;
+        }
+
+        .expand-icon {
+            width: 20px;
+            height: 20px;
+            transition: transform 0.3s ease;
+        }
+
+        .sop-reference-header.expanded .expand-icon {
+            transform: rotate(180deg);
+        }
+
+        .sop-reference-body {
+            max-height: 0;
+            overflow: hidden;
+            transition: max-height 0.4s ease;
+            background: white;
+        }
+
+        .sop-reference-body.expanded {
+            max-height: 500px;
+        }
+
+        .reference-content {
+            padding: 20px;
+        }
+
+        .reference-card {
+            background: #f8f9fa;
+            border-left: 4px solid #0066cc;
+            padding: 14px;
+            border-radius: 6px;
+            margin-bottom: 12px;
+        }
+
+        .reference-card:last-child {
+            margin-bottom: 0;
+        }
+
+        .card-label {
+            color: #0066cc;
+            font-weight: 700;
+            font-size: 11px;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-bottom: 6px;
+        }
+
+        .card-location {
+            color: #1e3a5f;
+            font-size: 15px;
+            font-weight: 600;
+            margin-bottom: 6px;
+        }
+
+        .card-description {
+            color: #555;
+            font-size: 13px;
+            line-height: 1.5;
+        }
+
+        @media (max-width: 768px) {
+            .header-text {
+                font-size: 13px;
+            }
+
+            .header-badge {
+                display: none;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="sop-reference-bar">
+        <div class="sop-reference-header" onclick="toggleReference(this)">
+            <div class="header-left">
+                <svg class="header-icon" fill="currentColor" viewBox="0 0 20 20">
+                    <path d="M9 4.804A7.968 7.968 0 005.5 4c-1.255 0-2.443.29-3.5.804v10A7.969 7.969 0 015.5 14c1.669 0 3.218.51 4.5 1.385A7.962 7.962 0 0114.5 14c1.255 0 2.443.29 3.5.804v-10A7.968 7.968 0 0014.5 4c-1.255 0-2.443.29-3.5.804V12a1 1 0 11-2 0V4.804z"/>
+                </svg>
+                <span class="header-text">SOP Reference</span>
+                <span class="header-badge">{{ref_count}} ref{{ref_plural}}</span>
+            </div>
+            <svg class="expand-icon" fill="currentColor" viewBox="0 0 20 20">
+                <path fill-rule="evenodd" d="M5.293 7.293a1 1 0 011.414 0L10 10.586l3.293-3.293a1 1 0 111.414 1.414l-4 4a1 1 0 01-1.414 0l-4-4a1 1 0 010-1.414z" clip-rule="evenodd"/>
+            </svg>
+        </div>
+        <div class="sop-reference-body">
+            <div class="reference-content">
+                {{items}}
+            </div>
+        </div>
+    </div>
+
+    <script>
+        function toggleReference(header) {
+            const body = header.nextElementSibling;
+            header.classList.toggle('expanded');
+            body.classList.toggle('expanded');
+        }
+    </script>
+</body>
+</html>"""
+
+DESIGN_B_SOP_ITEM = """
+                <div class="reference-card">
+                    <div class="card-label">MPP SOP</div>
+                    <div class="card-location">{{sop_section}}, Pages {{sop_pages}}</div>
+                    <div class="card-description">
+                        {{description}}
+                    </div>
+                </div>
+            """
+
+DESIGN_B_APPENDIX_ITEM = """
+                <div class="reference-card">
+                    <div class="card-label">{{appendix_section}}</div>
+                    <div class="card-location">Pages {{appendix_pages}}</div>
+                    <div class="card-description">
+                        {{description}}
+                    </div>
+                </div>
+            """
+
+
+# Design C: Minimal Accordion
+DESIGN_C_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SOP Reference</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+        }
+
+        .sop-reference-minimal {
+            margin-top: 20px;
+            border: 1px solid #dee2e6;
+            border-radius: 6px;
+            overflow: hidden;
+        }
+
+        .minimal-trigger {
+            background: white;
+            padding: 10px 14px;
+            cursor: pointer;
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+            transition: all 0.2s ease;
+            border-left: 3px solid #0066cc;
+        }
+
+        .minimal-trigger:hover {
+            background: #f8f9fa;
+        }
+
+        .trigger-content {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+        }
+
+        .trigger-icon {
+            width: 16px;
+            height: 16px;
+            color: #0066cc;
+        }
+
+        .trigger-text {
+            color: #495057;
+            font-size: 13px;
+            font-weight: 600;
+        }
+
+        .trigger-count {
+            background: #e8f4f8;
+            color: #0066cc;
+            padding: 2px 8px;
+            border-radius: 10px;
+            font-size: 11px;
+            font-weight: 600;
+            margin-left: 6px;
+        }
+
+        .chevron {
+            width: 16px;
+            height: 16px;
+            color: #6c757d;
+            transition: transform 0.3s ease;
+        }
+
+        .minimal-trigger.expanded .chevron {
+            transform: rotate(180deg);
+        }
+
+        .minimal-body {
+            max-height: 0;
+            overflow: hidden;
+            transition: max-height 0.3s ease;
+            background: #fafafa;
+        }
+
+        .minimal-body.expanded {
+            max-height: 400px;
+        }
+
+        .minimal-content {
+            padding: 16px;
+        }
+
+        .ref-item {
+            background: white;
+            border-left: 3px solid #0066cc;
+            padding: 12px;
+            border-radius: 4px;
+            margin-bottom: 10px;
+        }
+
+        .ref-item:last-child {
+            margin-bottom: 0;
+        }
+
+        .ref-meta {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            margin-bottom: 6px;
+        }
+
+        .ref-tag {
+            background: #0066cc;
+            color: white;
+            padding: 2px 8px;
+            border-radius: 4px;
+            font-size: 10px;
+            font-weight: 700;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+
+        .ref-location {
+            color: #1e3a5f;
+            font-size: 14px;
+            font-weight: 600;
+        }
+
+        .ref-desc {
+            color: #6c757d;
+            font-size: 13px;
+            line-height: 1.4;
+        }
+
+        @media (max-width: 768px) {
+            .trigger-text {
+                font-size: 12px;
+            }
+
+            .trigger-count {
+                font-size: 10px;
+                padding: 2px 6px;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="sop-reference-minimal">
+        <div class="minimal-trigger" onclick="toggleMinimal(this)">
+            <div class="trigger-content">
+                <svg class="trigger-icon" fill="currentColor" viewBox="0 0 20 20">
+                    <path fill-rule="evenodd" d="M18 10a8 8 0 11-16 0 8 8 0 0116 0zm-7-4a1 1 0 11-2 0 1 1 0 012 0zM9 9a1 1 0 000 2v3a1 1 0 001 1h1a1 1 0 100-2v-3a1 1 0 00-1-1H9z" clip-rule="evenodd"/>
+                </svg>
+                <span class="trigger-text">{{trigger_text}}</span>
+                <span class="trigger-count">{{ref_count}}</span>
+            </div>
+            <svg class="chevron" fill="currentColor" viewBox="0 0 20 20">
+                <path fill-rule="evenodd" d="M5.293 7.293a1 1 0 011.414 0L10 10.586l3.293-3.293a1 1 0 111.414 1.414l-4 4a1 1 0 01-1.414 0l-4-4a1 1 0 010-1.414z" clip-rule="evenodd"/>
+            </svg>
+        </div>
+        <div class="minimal-body">
+            <div class="minimal-content">
+                {{items}}
+            </div>
+        </div>
+    </div>
+
+    <script>
+        function toggleMinimal(trigger) {
+            const body = trigger.nextElementSibling;
+            trigger.classList.toggle('expanded');
+            body.classList.toggle('expanded');
+        }
+    </script>
+</body>
+</html>"""
+
+DESIGN_C_SOP_ITEM = """
+                <div class="ref-item">
+                    <div class="ref-meta">
+                        <span class="ref-tag">SOP</span>
+                        <span class="ref-location">{{sop_section}}, Pages {{sop_pages}}</span>
+                    </div>
+                    <div class="ref-desc">
+                        {{description}}
+                    </div>
+                </div>
+            """
+
+DESIGN_C_APPENDIX_ITEM = """
+                <div class="ref-item">
+                    <div class="ref-meta">
+                        <span class="ref-tag">{{appendix_section}}</span>
+                        <span class="ref-location">Pages {{appendix_pages}}</span>
+                    </div>
+                    <div class="ref-desc">
+                        {{description}}
+                    </div>
+                </div>
+            """
+
+
+DESIGNS = {
+    "A": (DESIGN_A_PAGE, DESIGN_A_SOP_ITEM, DESIGN_A_APPENDIX_ITEM),
+    "B": (DESIGN_B_PAGE, DESIGN_B_SOP_ITEM, DESIGN_B_APPENDIX_ITEM),
+    "C": (DESIGN_C_PAGE, DESIGN_C_SOP_ITEM, DESIGN_C_APPENDIX_ITEM),
+}
+
+
+@lru_cache(maxsize=None)
+def shared_asset(design, minify=False):
+    """(filename, text) of a design's stylesheet, named by a hash of its content"""
+    css = STYLE_BLOCK.search(DESIGNS[design][0]).group(1)
+    css = minify_css(css) if minify else css.strip() + "\n"
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    return f"design_{design}.{digest}.css", css
+
+
+@lru_cache(maxsize=None)
+def get_renderer(design, minify=False, asset_base_url=None):
+    """
+    Compiled render(ref_data) for a design in an output mode
+
+    Args:
+        design: 'A', 'B' or 'C'
+        minify: Minify the static HTML, CSS and JS
+        asset_base_url: If set, link the design's shared stylesheet at this
+            URL prefix (e.g. '' for the embed's own folder) instead of inlining it
+    """
+    page, sop_item, appendix_item = DESIGNS[design]
+    if asset_base_url is not None:
+        filename, _ = shared_asset(design, minify)
+        link = f'<link rel="stylesheet" href="{asset_base_url}{filename}">'
+        page = STYLE_BLOCK.sub(lambda m: link, page, count=1)
+    if minify:
+        page, sop_item, appendix_item = map(minify_html, (page, sop_item, appendix_item))
+    return compile_design(page, sop_item, appendix_item, separator="" if minify else "\n")
+
+
+RENDERERS = {design: get_renderer(design) for design in DESIGNS}
+
+
+def render_design(design, ref_data, minify=False, asset_base_url=None):
+    """Render one reference row with the compiled templates of a design"""
+    return get_renderer(design, minify, asset_base_url)(ref_data)
@@ -0,0 +1,197 @@
+"""
+Streaming reader and validator for the reference mapping CSV
+
+The header is checked as soon as a ReferenceReader is created, so a missing
+column fails before any embed is written. Rows are then streamed one at a
+time as compact ReferenceRow records (one tuple of cells plus a shared
+schema) instead of a dict per row; rows that cannot be rendered are skipped
+and collected, so one pass reports every bad row. Memory stays flat however
+many courses the file covers.
+
+Validate a mapping file without generating anything:
+    python reference_csv.py reference_mapping_template.csv
+"""
+
+import argparse
+import csv
+import re
+import sys
+
+# Columns the embeds are built from; any others (e.g. Notes) are carried along
+REQUIRED_COLUMNS = (
+    'Module Number',
+    'Module Name',
+    'Lesson Section Title',
+    'Reference Trigger Text',
+    'SOP Section',
+    'SOP Page Numbers',
+    'Appendix Section',
+    'Appendix Page Numbers',
+    'Reference Description',
+    'Design Choice',
+)
+DESIGNS = ('A', 'B', 'C')
+PAGE_RANGES = re.compile(r"^\s*\w+(?:\s*-\s*\w+)?(?:\s*,\s*\w+(?:\s*-\s*\w+)?)*\s*$")
+
+
+class ReferenceCSVError(ValueError):
+    """A mapping file that cannot be generated from; problems lists every issue found"""
+
+    def __init__(self, path, problems):
+        self.path = path
+        self.problems = problems
+        lines = "\n".join(f"  {problem}" for problem in problems[:50])
+        more = f"\n  ... and {len(problems) - 50} more" if len(problems) > 50 else ""
+        super().__init__(f"{path}: {len(problems)} problem(s)\n{lines}{more}")
+
+
+class ReferenceSchema:
+    """Column names of one mapping file and their positions"""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.index = {column: i for i, column in enumerate(self.columns)}
+
+
+class ReferenceRow:
+    """
+    One mapping row: its cells in file order, readable by column name
+
+    Supports row['Column'], get(), keys() and items() like the dict that
+    csv.DictReader produced, so templates and row hashes are unchanged.
+    """
+
+    __slots__ = ('schema', 'values', 'line')
+
+    def __init__(self, schema, values, line):
+        self.schema = schema
+        self.values = values
+        self.line = line
+
+    def __getitem__(self, column):
+        return self.values[self.schema.index[column]]
+
+    def get(self, column, default=None):
+        i = self.schema.index.get(column)
+        return default if i is None else self.values[i]
+
+    def keys(self):
+        return self.schema.columns
+
+    def items(self):
+        return zip(self.schema.columns, self.values)
+
+    @property
+    def module_number(self):
+        return int(self['Module Number'])
+
+    @property
+    def design(self):
+        """'A', 'B' or 'C'; unknown choices fall back to B"""
+        design = self['Design Choice'].strip().upper()
+        return design if design in DESIGNS else 'B'
+
+    def __repr__(self):
+        return f"ReferenceRow(line={self.line}, {dict(self.items())!r})"
+
+
+class ReferenceReader:
+    """Validating, streaming iterator over a mapping file's rows"""
+
+    def __init__(self, path):
+        """
+        Open a mapping file and check its header
+
+        Raises:
+            ReferenceCSVError: The header is missing required columns
+        """
+        self.path = path
+        self.errors = []
+        self.warnings = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), [])
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ReferenceCSVError(path, [f"missing column(s): {', '.join(missing)}"])
+        self.schema = ReferenceSchema(header)
+
+    def __iter__(self):
+        """Yield valid rows; problems with the others are collected in errors"""
+        self.errors = []
+        self.warnings = []
+        width = len(self.schema.columns)
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for cells in reader:
+                if not any(cell.strip() for cell in cells):
+                    continue
+                line = reader.line_num
+                if len(cells) > width:
+                    self.errors.append(f"line {line}: {len(cells)} cells for {width} columns "
+                                       f"(quote cells that contain commas)")
+                    continue
+                # Trailing empty cells may be left out
+                row = ReferenceRow(self.schema, tuple(cells) + ('',) * (width - len(cells)), line)
+                problems = self.check(row)
+                if problems:
+                    self.errors.extend(f"line {line}: {problem}" for problem in problems)
+                    continue
+                yield row
+
+    def check(self, row):
+        """Reasons a row cannot be generated; minor issues go to warnings"""
+        problems = []
+        if not row['Module Number'].strip().isdigit():
+            problems.append(f"Module Number {row['Module Number']!r} is not a whole number")
+        if not row['Lesson Section Title'].strip():
+            problems.append("Lesson Section Title is empty")
+
+        if row['Design Choice'].strip().upper() not in DESIGNS:
+            self.warnings.append(f"line {row.line}: unknown design {row['Design Choice']!r}, using Design B")
+        if not row['SOP Section'] and not row['Appendix Section']:
+            self.warnings.append(f"line {row.line}: no SOP or Appendix Section, the embed lists no references")
+        for column in ('SOP Page Numbers', 'Appendix Page Numbers'):
+            if row[column] and not PAGE_RANGES.match(row[column]):
+                self.warnings.append(f"line {row.line}: {column} {row[column]!r} is not a page range like 8-10")
+        return problems
+
+    def raise_for_errors(self):
+        """Raise ReferenceCSVError if the last pass skipped any rows"""
+        if self.errors:
+            raise ReferenceCSVError(self.path, self.errors)
+
+
+def validate(path):
+    """Row count, errors and warnings of a mapping file, in one streaming pass"""
+    reader = ReferenceReader(path)
+    count = sum(1 for _ in reader)
+    return count, reader.errors, reader.warnings
+
+
+def main():
+    """Validate mapping files"""
+    parser = argparse.ArgumentParser(description="Validate reference mapping CSVs")
+    parser.add_argument("csv", nargs="+", help="Mapping files to check")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.csv:
+        try:
+            count, errors, warnings = validate(path)
+        except ReferenceCSVError as e:
+            print(f"[FAIL] {e}")
+            failed = True
+            continue
+        for warning in warnings:
+            print(f"  Warning: {warning}")
+        for error in errors:
+            print(f"  Error: {error}")
+        status = "FAIL" if errors else "OK"
+        print(f"[{status}] {path}: {count} valid rows, {len(errors)} errors, {len(warnings)} warnings")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
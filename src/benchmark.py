@@ -0,0 +1,315 @@
+"""Retrieval benchmark and evaluation harness.
+
+Measures build time per stage, index size, load time, query latency
+percentiles, throughput under concurrent clients, and recall@k / MRR
+against the golden question set. Results are written as JSON so runs can
+be compared.
+
+Usage:
+    python benchmark.py --corpus "../../Core Documents" --corpus "../../Modules" \\
+        --output results.json --compare previous.json
+    python benchmark.py --skip-build --index ../data/faiss_index
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import io
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pdf_processor import PDFProcessor
+from pdf_extractors import DEFAULT_EXTRACTOR, EXTRACTORS
+from rag_system import RAGSystem
+from dedup import ChunkDeduplicator
+
+DEFAULT_GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "golden_questions.json")
+RECALL_KS = (1, 4, 8)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def load_golden(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["questions"]
+
+
+def benchmark_build(rag, folders, index_path, chunk_size=1000, chunk_overlap=200, extractor=DEFAULT_EXTRACTOR):
+    """Build and save the index, timing each stage (no page cache, so extraction is measured)."""
+    stages = {}
+    processor = PDFProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap, extractor=extractor)
+
+    start = time.perf_counter()
+    documents = processor.extract_pdfs(folders)
+    stages["extract_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = processor.chunk_documents(documents)
+    stages["split_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = ChunkDeduplicator().dedupe(chunks)
+    stages["dedup_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rag.build_vector_store(chunks)
+    stages["embed_index_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    os.makedirs(index_path, exist_ok=True)
+    rag.save_vector_store(index_path)
+    stages["save_s"] = time.perf_counter() - start
+
+    return {
+        "pages": len(documents),
+        "chunks": len(chunks),
+        "stages": stages,
+        "total_s": sum(stages.values()),
+    }
+
+
+def benchmark_load(rag, index_path):
+    start = time.perf_counter()
+    rag.load_vector_store(index_path)
+    return {
+        "load_s": time.perf_counter() - start,
+        "index_bytes": directory_size(index_path),
+        "vectors": rag.vector_store.index.ntotal,
+    }
+
+
+def benchmark_latency(rag, questions, runs=3):
+    """Single-client retrieval latency percentiles in milliseconds."""
+    rag.retrieve(questions[0])  # warm-up
+    timings = []
+    for _ in range(runs):
+        for question in questions:
+            start = time.perf_counter()
+            rag.retrieve(question)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "queries": len(timings),
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "mean_ms": sum(timings) / len(timings),
+    }
+
+
+def benchmark_throughput(rag, questions, clients=4, queries_per_client=20):
+    """Queries per second with N clients issuing retrievals concurrently."""
+    def client(offset):
+        timings = []
+        for i in range(queries_per_client):
+            start = time.perf_counter()
+            rag.retrieve(questions[(offset + i) % len(questions)])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        timings = [t for result in pool.map(client, range(clients)) for t in result]
+    elapsed = time.perf_counter() - start
+    return {
+        "clients": clients,
+        "queries": len(timings),
+        "qps": len(timings) / elapsed,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+    }
+
+
+def _ranked_pages(docs):
+    """The (source_file, page) pairs each document covers, in rank order."""
+    ranked = []
+    for doc in docs:
+        sources = doc.metadata.get("duplicate_sources") or [doc.metadata]
+        ranked.append({(s.get("source_file"), s.get("page")) for s in sources})
+    return ranked
+
+
+def _first_hit(ranked_pages, expected):
+    return next((rank for rank, pages in enumerate(ranked_pages, 1) if pages & expected), None)
+
+
+def _recall(ranked_pages, expected):
+    found = set().union(*ranked_pages) & expected if ranked_pages else set()
+    return len(found) / len(expected)
+
+
+def evaluate_golden(rag, golden, ks=RECALL_KS):
+    """
+    Compute recall@k and MRR against the golden question set.
+
+    recall@k and MRR are scored at a fixed depth of max(ks) through
+    RAGSystem.similarity_search_with_score, which applies the same query
+    expansion and index lock as users' questions but not adaptive k, so
+    recall@8 really looks at eight chunks. The chunks RAGSystem.retrieve
+    returns (adaptive k, FAQ cache, micro-batching) are scored separately
+    as adaptive_recall and adaptive_mrr, with their mean count as
+    mean_chunks. A retrieved chunk matches an expected page if its
+    source_file and page (or any of its duplicate_sources) equal the
+    expected ones.
+    """
+    depth = max(ks)
+    recalls = {k: [] for k in ks}
+    reciprocal_ranks = []
+    adaptive_recalls = []
+    adaptive_reciprocal_ranks = []
+    retrieved = []
+    per_question = []
+
+    for item in golden:
+        expected = {(e["source_file"], e["page"]) for e in item["expected"]}
+
+        ranked_pages = _ranked_pages(doc for doc, _ in rag.similarity_search_with_score(item["question"], k=depth))
+        first_hit = _first_hit(ranked_pages, expected)
+        reciprocal_ranks.append(1.0 / first_hit if first_hit else 0.0)
+        for k in ks:
+            recalls[k].append(_recall(ranked_pages[:k], expected))
+
+        docs = rag.retrieve(item["question"])
+        retrieved.append(len(docs))
+        adaptive_pages = _ranked_pages(docs)
+        adaptive_hit = _first_hit(adaptive_pages, expected)
+        adaptive_reciprocal_ranks.append(1.0 / adaptive_hit if adaptive_hit else 0.0)
+        adaptive_recalls.append(_recall(adaptive_pages, expected))
+
+        per_question.append({
+            "id": item["id"],
+            "first_hit_rank": first_hit,
+            "adaptive_first_hit_rank": adaptive_hit,
+            "retrieved": len(docs),
+        })
+
+    count = max(1, len(golden))
+    return {
+        "questions": len(golden),
+        **{f"recall@{k}": sum(values) / count for k, values in recalls.items()},
+        "mrr": sum(reciprocal_ranks) / count,
+        "adaptive_recall": sum(adaptive_recalls) / count,
+        "adaptive_mrr": sum(adaptive_reciprocal_ranks) / count,
+        "mean_chunks": sum(retrieved) / count,
+        "per_question": per_question,
+    }
+
+
+def compare_results(current, previous):
+    """Print headline metrics side by side with a previous results file."""
+    rows = [
+        ("build total s", ("build", "total_s")),
+        ("load s", ("load", "load_s")),
+        ("index bytes", ("load", "index_bytes")),
+        ("p50 ms", ("latency", "p50_ms")),
+        ("p95 ms", ("latency", "p95_ms")),
+        ("p99 ms", ("latency", "p99_ms")),
+        ("qps", ("throughput", "qps")),
+        ("mrr", ("quality", "mrr")),
+    ] + [(f"recall@{k}", ("quality", f"recall@{k}")) for k in RECALL_KS] + [
+        ("adaptive recall", ("quality", "adaptive_recall")),
+        ("adaptive mrr", ("quality", "adaptive_mrr")),
+        ("chunks/question", ("quality", "mean_chunks")),
+    ]
+
+    print(f"\n{'metric':<16} {'previous':>14} {'current':>14} {'change':>9}")
+    for label, (section, key) in rows:
+        old = previous.get(section, {}).get(key)
+        new = current.get(section, {}).get(key)
+        if old is None or new is None:
+            continue
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{label:<16} {old:>14.4f} {new:>14.4f} {change:>9}")
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Benchmark and evaluate the RAG system")
+    parser.add_argument("--corpus", action="append", default=[],
+                        help="Folder of PDFs to build from (repeatable)")
+    parser.add_argument("--index", help="Index location (temporary directory if omitted)")
+    parser.add_argument("--skip-build", action="store_true", help="Benchmark an existing --index")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--extractor", choices=list(EXTRACTORS), default=DEFAULT_EXTRACTOR, help="PDF backend")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN, help="Golden question set (JSON)")
+    parser.add_argument("--runs", type=int, default=3, help="Latency passes over the question set")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients for QPS")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    if args.skip_build and not args.index:
+        parser.error("--skip-build requires --index")
+    if not args.skip_build and not args.corpus:
+        parser.error("--corpus is required unless --skip-build is given")
+
+    index_path = args.index or tempfile.mkdtemp(prefix="mpp_bench_index_")
+    golden = load_golden(args.golden)
+    questions = [item["question"] for item in golden]
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": args.corpus,
+            "chunk_size": args.chunk_size,
+            "chunk_overlap": args.chunk_overlap,
+            "extractor": args.extractor,
+        },
+    }
+
+    if not args.skip_build:
+        rag = RAGSystem(use_openai=False)
+        results["build"] = benchmark_build(rag, args.corpus, index_path,
+                                           args.chunk_size, args.chunk_overlap, args.extractor)
+
+    rag = RAGSystem(use_openai=False)
+    results["load"] = benchmark_load(rag, index_path)
+    results["latency"] = benchmark_latency(rag, questions, args.runs)
+    results["throughput"] = benchmark_throughput(rag, questions, args.clients)
+    results["quality"] = evaluate_golden(rag, golden)
+
+    quality = results["quality"]
+    print(f"\nLatency p50/p95/p99: {results['latency']['p50_ms']:.1f} / "
+          f"{results['latency']['p95_ms']:.1f} / {results['latency']['p99_ms']:.1f} ms")
+    print(f"Throughput: {results['throughput']['qps']:.1f} QPS with {args.clients} clients")
+    print("Quality: " + ", ".join(f"recall@{k}={quality[f'recall@{k}']:.3f}" for k in RECALL_KS)
+          + f", MRR={quality['mrr']:.3f}")
+    print(f"Adaptive k: recall={quality['adaptive_recall']:.3f}, MRR={quality['adaptive_mrr']:.3f}, "
+          f"{quality['mean_chunks']:.1f} chunks/question")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_results(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Compact chunk store for the FAISS docstore.
+
+LangChain's InMemoryDocstore keeps one Document per chunk, each with its own
+copy of the text and its own metadata dict; with 200-character overlaps
+about a fifth of the corpus text is stored twice, and all of it is pickled
+into index.pkl. CompactDocstore stores each page's text once, chunks as
+(page_id, start, end, meta_id) rows in typed arrays, and each distinct
+metadata dict once. A Document is only built when FAISS looks up a hit.
+
+Report memory footprint and load time against the default docstore:
+    python chunk_store.py ../data/source_documents
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import io
+import time
+import tracemalloc
+from array import array
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_core.documents import Document
+
+# Overlaps at least this long are found with str.find; shorter ones by scanning the tail
+OVERLAP_PROBE_CHARS = 32
+
+
+def page_key(metadata):
+    """Chunks with the same key are cut from the same page."""
+    return (metadata.get("source", metadata.get("source_file")), metadata.get("page"))
+
+
+def overlap_start(page, text):
+    """Offset in page where a chunk starting with page's tail begins, or -1."""
+    lower = max(0, len(page) - len(text))
+    probe = text[:OVERLAP_PROBE_CHARS]
+    pos = page.find(probe, lower)
+    while pos != -1:
+        if text.startswith(page[pos:]):
+            return pos
+        pos = page.find(probe, pos + 1)
+    for pos in range(max(lower, len(page) - OVERLAP_PROBE_CHARS), len(page)):
+        if text.startswith(page[pos:]):
+            return pos
+    return -1
+
+
+class CompactDocstore(Docstore, AddableMixin):
+    """Docstore holding pages once and chunks as array-backed spans into them."""
+
+    def __init__(self):
+        self._pages = []
+        self._page_index = {}
+        self._page_refs = array("i")
+        self._metas = []
+        self._meta_index = {}
+        # One row per chunk; page_id -1 marks a deleted chunk
+        self._page_ids = array("i")
+        self._starts = array("i")
+        self._ends = array("i")
+        self._meta_ids = array("i")
+        self._rows = {}
+
+    def __getstate__(self):
+        # The intern lookup is rebuilt on the next add rather than pickled
+        state = self.__dict__.copy()
+        state["_meta_index"] = None
+        return state
+
+    def _intern_meta(self, metadata):
+        if self._meta_index is None:
+            self._meta_index = {
+                json.dumps(meta, sort_keys=True, default=str): meta_id
+                for meta_id, meta in enumerate(self._metas)
+            }
+        key = json.dumps(metadata, sort_keys=True, default=str)
+        meta_id = self._meta_index.get(key)
+        if meta_id is None:
+            meta_id = self._meta_index[key] = len(self._metas)
+            self._metas.append(dict(metadata))
+        return meta_id
+
+    def _place(self, text, metadata):
+        """Locate text in its page, extending the page if needed; return (page_id, start)."""
+        key = page_key(metadata)
+        page_id = self._page_index.get(key)
+        if page_id is None:
+            page_id = self._page_index[key] = len(self._pages)
+            self._pages.append(text)
+            self._page_refs.append(0)
+            return page_id, 0
+
+        page = self._pages[page_id]
+        start = page.find(text)
+        if start != -1:
+            return page_id, start
+        start = overlap_start(page, text)
+        if start == -1:
+            # Not contiguous with the page so far; keep it after a gap
+            start = len(page) + 1
+            self._pages[page_id] = page + "\n" + text
+        else:
+            self._pages[page_id] = page + text[len(page) - start:]
+        return page_id, start
+
+    def add(self, texts):
+        """Add Documents keyed by docstore ID."""
+        overlapping = set(texts).intersection(self._rows)
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+        for doc_id, doc in texts.items():
+            page_id, start = self._place(doc.page_content, doc.metadata)
+            self._rows[doc_id] = len(self._page_ids)
+            self._page_ids.append(page_id)
+            self._starts.append(start)
+            self._ends.append(start + len(doc.page_content))
+            self._meta_ids.append(self._intern_meta(doc.metadata))
+            self._page_refs[page_id] += 1
+
+    def delete(self, ids):
+        missing = set(ids).difference(self._rows)
+        if missing:
+            raise ValueError(f"Tried to delete ids that does not exist: {missing}")
+        for doc_id in ids:
+            row = self._rows.pop(doc_id)
+            page_id = self._page_ids[row]
+            self._page_ids[row] = -1
+            self._page_refs[page_id] -= 1
+            if self._page_refs[page_id] == 0:
+                # Release the text; a re-added page starts afresh
+                self._pages[page_id] = ""
+                self._page_index = {k: v for k, v in self._page_index.items() if v != page_id}
+
+    def search(self, search):
+        """Materialize the Document for a docstore ID."""
+        row = self._rows.get(search)
+        if row is None:
+            return f"ID {search} not found."
+        page = self._pages[self._page_ids[row]]
+        return Document(
+            id=search,
+            page_content=page[self._starts[row]:self._ends[row]],
+            metadata=dict(self._metas[self._meta_ids[row]]),
+        )
+
+    def __len__(self):
+        return len(self._rows)
+
+    def stats(self):
+        """Characters stored versus characters across all chunks."""
+        chunk_chars = sum(
+            self._ends[row] - self._starts[row] for row in self._rows.values()
+        )
+        return {
+            "chunks": len(self._rows),
+            "pages": sum(1 for refs in self._page_refs if refs > 0),
+            "metadata_dicts": len(self._metas),
+            "stored_chars": sum(len(page) for page in self._pages),
+            "chunk_chars": chunk_chars,
+        }
+
+    @classmethod
+    def from_docstore(cls, docstore):
+        """Convert an InMemoryDocstore, keeping document order."""
+        compact = cls()
+        compact.add(dict(docstore._dict))
+        return compact
+
+
+def measure(docstore):
+    """Pickled size, unpickle time and resident size of a docstore."""
+    blob = pickle.dumps(docstore)
+    start = time.perf_counter()
+    pickle.loads(blob)
+    load_s = time.perf_counter() - start
+
+    tracemalloc.start()
+    loaded = pickle.loads(blob)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return {"pickle_bytes": len(blob), "load_ms": load_s * 1000, "memory_bytes": current}
+
+
+def compare_docstores(chunks):
+    """Footprint of the default docstore and CompactDocstore for the same chunks."""
+    documents = {str(i): Document(page_content=c.page_content, metadata=dict(c.metadata))
+                 for i, c in enumerate(chunks)}
+    default = InMemoryDocstore(dict(documents))
+    compact = CompactDocstore()
+    compact.add(documents)
+    return {
+        "default": measure(default),
+        "compact": measure(compact),
+        "stats": compact.stats(),
+    }
+
+
+def convert_index(path):
+    """Switch a saved FAISS index to CompactDocstore in place."""
+    with open(os.path.join(path, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    if not isinstance(docstore, CompactDocstore):
+        docstore = CompactDocstore.from_docstore(docstore)
+    with open(os.path.join(path, "index.pkl"), "wb") as f:
+        pickle.dump((docstore, index_to_docstore_id), f)
+    return docstore.stats()
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Compare the compact chunk store with the default docstore")
+    parser.add_argument("folders", nargs="*", help="Folders of PDFs to chunk")
+    parser.add_argument("--convert", metavar="INDEX", help="Convert a saved index to the compact store")
+    args = parser.parse_args()
+
+    if args.convert:
+        stats = convert_index(args.convert)
+        print(f"Converted {args.convert}: {stats['chunks']} chunks in {stats['pages']} pages")
+        return
+    if not args.folders:
+        parser.error("give PDF folders to compare, or --convert INDEX")
+
+    from pdf_processor import PDFProcessor
+    from dedup import ChunkDeduplicator
+    processor = PDFProcessor()
+    chunks = ChunkDeduplicator().dedupe(processor.chunk_documents(processor.extract_pdfs(args.folders)))
+
+    report = compare_docstores(chunks)
+    stats = report["stats"]
+    print(f"\n{stats['chunks']} chunks from {stats['pages']} pages; "
+          f"{stats['chunk_chars']:,} chunk chars stored as {stats['stored_chars']:,} "
+          f"({stats['metadata_dicts']} distinct metadata dicts)")
+    print(f"{'Docstore':<10} {'Pickle':>12} {'Memory':>12} {'Load':>10}")
+    for name in ("default", "compact"):
+        r = report[name]
+        print(f"{name:<10} {r['pickle_bytes'] / 1024:>9.1f} KB {r['memory_bytes'] / 1024:>9.1f} KB "
+              f"{r['load_ms']:>7.2f} ms")
+    d, c = report["default"], report["compact"]
+    print(f"Reduction: pickle {1 - c['pickle_bytes'] / d['pickle_bytes']:.0%}, "
+          f"memory {1 - c['memory_bytes'] / d['memory_bytes']:.0%}, "
+          f"load {1 - c['load_ms'] / d['load_ms']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Non-interactive command-line interface for building, querying and benchmarking.
+
+Usage:
+    python cli.py build --corpus "../../Core Documents" --corpus "../../Modules" --workers 4
+    python cli.py update --corpus "../../Core Documents" --corpus "../../Modules"
+    python cli.py --json query "What are the mentor eligibility requirements?"
+    python cli.py batch-query --input questions.txt --output answers.jsonl
+    python cli.py bench --output results.json --compare previous.json
+
+With --json, progress messages go to stderr and stdout carries only JSON.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import io
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from pdf_processor import PDFProcessor
+from pdf_extractors import EXTRACTORS, file_hash
+from rag_system import RAGSystem
+from projection import DEFAULT_PROJECTION_DIM, PROJECTIONS
+from dedup import ChunkDeduplicator
+import benchmark
+from profiling import enable_profiling
+
+DEFAULT_INDEX = "../data/faiss_index"
+DEFAULT_PAGE_CACHE = "../data/page_cache.sqlite3"
+MANIFEST_NAME = "manifest.json"
+
+
+def find_pdfs(folders):
+    """All PDFs in the corpus folders, as resolved path strings."""
+    pdfs = []
+    for folder in folders:
+        if not os.path.isdir(folder):
+            print(f"Warning: Folder not found: {folder}")
+            continue
+        pdfs.extend(str(p.resolve()) for p in sorted(Path(folder).glob("*.pdf")))
+    return pdfs
+
+
+def load_manifest(index_path):
+    path = os.path.join(index_path, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(index_path, manifest):
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+    with open(os.path.join(index_path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def process_files(pdf_files, chunk_size, chunk_overlap, args):
+    """Extract, chunk and dedupe PDFs; return chunks and their new docstore IDs."""
+    processor = PDFProcessor(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        extractor=args.extractor,
+        page_cache=None if args.no_page_cache else args.page_cache,
+    )
+    documents = processor.extract_files(pdf_files, workers=args.workers)
+    chunks = processor.chunk_documents(documents)
+    chunks = ChunkDeduplicator().dedupe(chunks)
+    ids = [uuid.uuid4().hex for _ in chunks]
+    return chunks, ids
+
+
+def chunk_ids_by_file(chunks, ids):
+    """
+    Group docstore IDs by the resolved path of the PDFs they came from.
+
+    A chunk kept for a group of near-duplicates is listed under every file
+    in its duplicate_sources, since each of them relies on it.
+    """
+    grouped = {}
+    for chunk, chunk_id in zip(chunks, ids):
+        paths = [chunk.metadata.get("source", "")]
+        paths += [s["source"] for s in chunk.metadata.get("duplicate_sources", []) if s.get("source")]
+        for path in dict.fromkeys(str(Path(p).resolve()) for p in paths):
+            grouped.setdefault(path, []).append(chunk_id)
+    return grouped
+
+
+def cmd_build(args):
+    start = time.perf_counter()
+    pdf_files = find_pdfs(args.corpus)
+    chunks, ids = process_files(pdf_files, args.chunk_size, args.chunk_overlap, args)
+
+    rag = RAGSystem(use_openai=False, projection=args.projection, projection_dim=args.projection_dim)
+    rag.build_vector_store(chunks, ids=ids)
+    os.makedirs(args.index, exist_ok=True)
+    rag.save_vector_store(args.index)
+
+    grouped = chunk_ids_by_file(chunks, ids)
+    save_manifest(args.index, {
+        "corpus": [os.path.abspath(c) for c in args.corpus],
+        "chunk_size": args.chunk_size,
+        "chunk_overlap": args.chunk_overlap,
+        "files": {
+            path: {"sha256": file_hash(path), "chunk_ids": grouped.get(path, [])}
+            for path in pdf_files
+        },
+    })
+    return {
+        "command": "build",
+        "index": os.path.abspath(args.index),
+        "files": len(pdf_files),
+        "chunks": len(chunks),
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def cmd_update(args):
+    """
+    Re-index only new, changed and removed PDFs.
+
+    Near-duplicate collapsing applies within the updated files only; run
+    build for a full rebuild after large corpus changes.
+    """
+    start = time.perf_counter()
+    manifest = load_manifest(args.index)
+    if manifest is None:
+        raise SystemExit(f"No {MANIFEST_NAME} in {args.index}; run 'build' first")
+
+    corpus = args.corpus or manifest["corpus"]
+    # Keep chunking consistent with the existing index unless overridden
+    chunk_size = args.chunk_size or manifest["chunk_size"]
+    chunk_overlap = args.chunk_overlap if args.chunk_overlap is not None else manifest["chunk_overlap"]
+
+    known = manifest["files"]
+    current = {path: file_hash(path) for path in find_pdfs(corpus)}
+    added = [p for p in current if p not in known]
+    changed = [p for p in current if p in known and known[p]["sha256"] != current[p]]
+    removed = [p for p in known if p not in current]
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+
+    # A chunk shared with a file that is staying (a collapsed near-duplicate) is kept
+    outgoing = set(changed + removed)
+    still_used = {i for p, entry in known.items() if p not in outgoing for i in entry["chunk_ids"]}
+    stale_ids = list(dict.fromkeys(
+        i for p in changed + removed for i in known[p]["chunk_ids"] if i not in still_used
+    ))
+    rag.delete_documents(stale_ids)
+    for path in removed:
+        del known[path]
+
+    to_index = added + changed
+    if to_index:
+        chunks, ids = process_files(to_index, chunk_size, chunk_overlap, args)
+        rag.add_documents(chunks, ids=ids)
+        grouped = chunk_ids_by_file(chunks, ids)
+        for path in to_index:
+            known[path] = {"sha256": current[path], "chunk_ids": grouped.get(path, [])}
+
+    rag.save_vector_store(args.index)
+    manifest.update({"corpus": [os.path.abspath(c) for c in corpus], "files": known})
+    save_manifest(args.index, manifest)
+    return {
+        "command": "update",
+        "index": os.path.abspath(args.index),
+        "added": len(added),
+        "changed": len(changed),
+        "removed": len(removed),
+        "chunks_removed": len(stale_ids),
+        "vectors": rag.vector_store.index.ntotal,
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def answer_question(rag, question):
+    start = time.perf_counter()
+    docs = rag.retrieve(question)
+    answer = rag._generate_answer_local(question, docs)
+    return {
+        "question": question,
+        "answer": answer,
+        "sources": [
+            {"source_file": d.metadata.get("source_file", "unknown"), "page": d.metadata.get("page", "?")}
+            for d in docs
+        ],
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def cmd_query(args):
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    return {"command": "query", "results": [answer_question(rag, q) for q in args.questions]}
+
+
+def read_questions(path):
+    """Questions from a text file (one per line) or JSONL with a 'question' field."""
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    with stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line)["question"] if line.startswith("{") else line
+
+
+def cmd_batch_query(args, out):
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+
+    start = time.perf_counter()
+    count = 0
+    sink = open(args.output, "w", encoding="utf-8") if args.output else out
+    try:
+        for question in read_questions(args.input):
+            sink.write(json.dumps(answer_question(rag, question)) + "\n")
+            count += 1
+    finally:
+        if args.output:
+            sink.close()
+    return {
+        "command": "batch-query",
+        "questions": count,
+        "output": args.output,
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def cmd_bench(args):
+    golden = benchmark.load_golden(args.golden)
+    questions = [item["question"] for item in golden]
+    results = {"meta": {"timestamp": datetime.now(timezone.utc).isoformat(), "index": args.index}}
+
+    index_path = args.index
+    if args.corpus:
+        # Benchmark a fresh build without touching the live index
+        index_path = tempfile.mkdtemp(prefix="mpp_bench_index_")
+        rag = RAGSystem(use_openai=False)
+        results["build"] = benchmark.benchmark_build(
+            rag, args.corpus, index_path, args.chunk_size, args.chunk_overlap, args.extractor
+        )
+
+    rag = RAGSystem(use_openai=False)
+    results["load"] = benchmark.benchmark_load(rag, index_path)
+    results["latency"] = benchmark.benchmark_latency(rag, questions, args.runs)
+    results["throughput"] = benchmark.benchmark_throughput(rag, questions, args.clients)
+    results["quality"] = benchmark.evaluate_golden(rag, golden)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            benchmark.compare_results(results, json.load(f))
+    return {"command": "bench", **results}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="DoD MPP RAG command-line interface")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="Index location")
+    parser.add_argument("--json", action="store_true", help="Machine-readable JSON on stdout")
+    parser.add_argument("--profile", nargs="?", const="./profiles", metavar="DIR",
+                        help="Profile each stage and write reports to DIR")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_chunking(p, defaults=True):
+        p.add_argument("--chunk-size", type=int, default=1000 if defaults else None)
+        p.add_argument("--chunk-overlap", type=int, default=200 if defaults else None)
+        p.add_argument("--workers", type=int, default=1, help="Parallel PDF extraction processes")
+        p.add_argument("--extractor", choices=list(EXTRACTORS), default="pypdf", help="PDF backend")
+        p.add_argument("--page-cache", default=DEFAULT_PAGE_CACHE, help="Extracted page cache file")
+        p.add_argument("--no-page-cache", action="store_true", help="Always re-parse PDFs")
+
+    p = sub.add_parser("build", help="Build the index from scratch")
+    p.add_argument("--corpus", action="append", required=True, help="Folder of PDFs (repeatable)")
+    add_chunking(p)
+    p.add_argument("--projection", choices=PROJECTIONS, help="Store vectors reduced by a fitted projection")
+    p.add_argument("--projection-dim", type=int, default=DEFAULT_PROJECTION_DIM,
+                   help="Dimension of the projected vectors")
+
+    p = sub.add_parser("update", help="Re-index new, changed and removed PDFs")
+    p.add_argument("--corpus", action="append", help="Folder of PDFs (defaults to the build corpus)")
+    add_chunking(p, defaults=False)
+
+    p = sub.add_parser("query", help="Answer one or more questions")
+    p.add_argument("questions", nargs="+")
+
+    p = sub.add_parser("batch-query", help="Answer questions from a file, writing JSONL")
+    p.add_argument("--input", required=True, help="Text file (one question per line), JSONL, or - for stdin")
+    p.add_argument("--output", help="JSONL output file (stdout if omitted)")
+
+    p = sub.add_parser("bench", help="Benchmark the index (see benchmark.py)")
+    p.add_argument("--corpus", action="append", help="Also benchmark a fresh build from these folders")
+    p.add_argument("--golden", default=benchmark.DEFAULT_GOLDEN, help="Golden question set (JSON)")
+    p.add_argument("--runs", type=int, default=3)
+    p.add_argument("--clients", type=int, default=4)
+    p.add_argument("--output", help="Write results JSON here")
+    p.add_argument("--compare", help="Previous results JSON to compare against")
+    add_chunking(p)
+    return parser
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    args = build_parser().parse_args()
+
+    profiler = enable_profiling(args.profile) if args.profile else None
+    out = sys.stdout
+    # Keep stdout clean for JSON: library progress output goes to stderr
+    log_target = sys.stderr if args.json else sys.stdout
+
+    with contextlib.redirect_stdout(log_target):
+        if args.command == "build":
+            result = cmd_build(args)
+        elif args.command == "update":
+            result = cmd_update(args)
+        elif args.command == "query":
+            result = cmd_query(args)
+        elif args.command == "batch-query":
+            result = cmd_batch_query(args, out)
+        else:
+            result = cmd_bench(args)
+        if profiler:
+            profiler.write_reports()
+
+    if args.json:
+        out.write(json.dumps(result, indent=2, default=str) + "\n")
+    elif args.command == "query":
+        for item in result["results"]:
+            print(f"\nQuestion: {item['question']}\n\n{item['answer']}\n")
+    elif args.command == "bench":
+        latency, quality = result["latency"], result["quality"]
+        print(f"Latency p50/p95/p99: {latency['p50_ms']:.1f} / {latency['p95_ms']:.1f} / "
+              f"{latency['p99_ms']:.1f} ms, {result['throughput']['qps']:.1f} QPS, "
+              f"MRR={quality['mrr']:.3f}")
+    elif args.command != "batch-query" or args.output:
+        summary = {k: v for k, v in result.items() if not isinstance(v, (dict, list))}
+        print(", ".join(f"{k}={v}" for k, v in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
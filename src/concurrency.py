@@ -0,0 +1,217 @@
+"""Concurrency primitives for serving many queries from one RAGSystem.
+
+RWLock lets any number of searches run together while an index update
+waits for them and then runs alone. BatchingEmbedder merges single-question
+embeddings that arrive while the model is busy into one batch, so
+concurrent sessions share a forward pass instead of queueing behind each
+other.
+
+Stress test (readers querying while a writer adds, deletes and rebuilds):
+    python concurrency.py --index ../data/faiss_index --readers 16 --seconds 20
+"""
+import argparse
+import random
+import sys
+import io
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from metrics import metrics
+
+
+class RWLock:
+    """Many readers or one writer; waiting writers block new readers."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class BatchingEmbedder:
+    """Thread-safe embed_query that batches questions arriving while the model is busy."""
+
+    def __init__(self, embeddings, max_batch_size=32):
+        """
+        Initialize the embedder.
+
+        Args:
+            embeddings: LangChain embeddings to encode with
+            max_batch_size: Most questions encoded in one call
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = []
+        self._running = False
+
+    def embed_query(self, text):
+        """Embed one question; blocks until its batch has been encoded."""
+        future = Future()
+        with self._cond:
+            self._pending.append((text, future))
+            # Wait to be served, or to lead once the current leader steps down
+            while self._running and not future.done():
+                self._cond.wait()
+            leader = not future.done()
+            if leader:
+                self._running = True
+        if leader:
+            # Encodes for everyone who queued meanwhile, until its own question is done
+            self._drain(future)
+        return future.result()
+
+    def _drain(self, own):
+        while True:
+            with self._cond:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:len(batch)]
+            if batch:
+                metrics.inc("embedder_batches")
+                metrics.inc("embedder_queries", len(batch))
+                try:
+                    vectors = self.embeddings.embed_documents([text for text, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                else:
+                    for (_, future), vector in zip(batch, vectors):
+                        future.set_result(vector)
+            with self._cond:
+                if own.done() or not self._pending:
+                    # Step down; a waiting thread whose question is still queued takes over,
+                    # so no caller keeps serving others indefinitely under sustained load
+                    self._running = False
+                    self._cond.notify_all()
+                    return
+                self._cond.notify_all()
+
+
+def stress_test(rag, questions, readers=8, seconds=10.0, write_interval=0.5):
+    """
+    Query from many threads while one thread keeps changing the index.
+
+    The writer adds and deletes a batch of chunks and periodically rebuilds
+    the whole store. Returns counts of queries, writes and errors.
+    """
+    from langchain_core.documents import Document
+
+    stop = threading.Event()
+    counts = {"queries": 0, "empty": 0, "writes": 0, "rebuilds": 0, "errors": []}
+    count_lock = threading.Lock()
+    probe = [
+        Document(page_content=f"Stress test chunk {i} about mentor reimbursement.",
+                 metadata={"source_file": "stress-test", "page": i})
+        for i in range(8)
+    ]
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            try:
+                docs = rag.retrieve(rng.choice(questions))
+                empty = not docs or any(not doc.page_content for doc in docs)
+                with count_lock:
+                    counts["queries"] += 1
+                    counts["empty"] += empty
+            except Exception as e:
+                with count_lock:
+                    counts["errors"].append(f"reader: {type(e).__name__}: {e}")
+
+    def writer():
+        snapshot = rag.vector_store
+        while not stop.wait(write_interval):
+            try:
+                ids = [uuid.uuid4().hex for _ in probe]
+                rag.add_documents(probe, ids=ids)
+                rag.delete_documents(ids)
+                counts["writes"] += 1
+                if counts["writes"] % 5 == 0:
+                    # Swap in a store rebuilt from the current chunks
+                    docs = [snapshot.docstore.search(i) for i in snapshot.index_to_docstore_id.values()]
+                    rag.build_vector_store(docs)
+                    counts["rebuilds"] += 1
+            except Exception as e:
+                counts["errors"].append(f"writer: {type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    counts["qps"] = counts["queries"] / (time.perf_counter() - start)
+    return counts
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Concurrency stress test for RAGSystem")
+    parser.add_argument("--index", default="../data/faiss_index", help="Index location")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent query threads")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Test duration")
+    parser.add_argument("--write-interval", type=float, default=0.5, help="Seconds between index writes")
+    args = parser.parse_args()
+
+    from rag_system import RAGSystem
+    from local_answerer import DEFAULT_QUESTIONS
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    metrics.reset()
+    print(f"\nStress testing with {args.readers} readers for {args.seconds:.0f}s...")
+    result = stress_test(rag, DEFAULT_QUESTIONS, args.readers, args.seconds, args.write_interval)
+
+    counters = metrics.to_dict()["counters"]
+    batches = counters.get("embedder_batches", 0)
+    print(f"Queries: {result['queries']} ({result['qps']:.1f} QPS), empty results: {result['empty']}")
+    print(f"Writes: {result['writes']} add/delete cycles, {result['rebuilds']} rebuilds")
+    if batches:
+        print(f"Query embeddings: {counters.get('embedder_queries', 0)} in {batches} batches "
+              f"({counters.get('embedder_queries', 0) / batches:.1f} per batch)")
+    print(f"Errors: {len(result['errors'])}")
+    for error in result["errors"][:10]:
+        print(f"  {error}")
+    sys.exit(1 if result["errors"] or result["empty"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Extractive context compression: keep only the sentences relevant to a question."""
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+from metrics import metrics
+
+# Sentence boundaries: end punctuation followed by whitespace, or a line that
+# starts a bullet / numbered item (common in the SOP and appendix PDFs)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*(?=[•●▪\-*]|\d+\.\s|\([a-z0-9]\)\s)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+class ContextCompressor:
+    """Scores sentences of retrieved chunks against the question and keeps the best ones."""
+
+    def __init__(self, embeddings, token_budget=300, min_sentence_chars=20, cache_size=5000):
+        """
+        Initialize the compressor.
+
+        Args:
+            embeddings: Embeddings model already loaded by RAGSystem
+            token_budget: Maximum estimated tokens in the compressed context
+            min_sentence_chars: Sentences shorter than this are dropped as noise
+            cache_size: Number of sentence embeddings to keep between queries
+        """
+        self.embeddings = embeddings
+        self.token_budget = token_budget
+        self.min_sentence_chars = min_sentence_chars
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # Shared by every session using this RAGSystem
+        self._cache_lock = threading.Lock()
+
+    def split_sentences(self, text):
+        """Split chunk text into cleaned sentences."""
+        sentences = []
+        for part in SENTENCE_BOUNDARY.split(text):
+            sentence = WHITESPACE.sub(" ", part).strip()
+            if len(sentence) >= self.min_sentence_chars:
+                sentences.append(sentence)
+        return sentences
+
+    def _embed_sentences(self, sentences):
+        """Embed sentences, reusing cached vectors for ones seen before."""
+        with self._cache_lock:
+            found = {s: self._cache[s] for s in dict.fromkeys(sentences) if s in self._cache}
+        missing = [s for s in dict.fromkeys(sentences) if s not in found]
+        metrics.inc("sentence_cache_hits", len(sentences) - len(missing))
+        metrics.inc("sentence_cache_misses", len(missing))
+        if missing:
+            # Encode outside the lock so other sessions can use the cache meanwhile
+            for sentence, vector in zip(missing, self.embeddings.embed_documents(missing)):
+                found[sentence] = np.asarray(vector, dtype=np.float32)
+        with self._cache_lock:
+            for sentence, vector in found.items():
+                self._cache[sentence] = vector
+                self._cache.move_to_end(sentence)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return np.vstack([found[sentence] for sentence in sentences])
+
+    def score_sentences(self, question, documents):
+        """
+        Score every sentence of the retrieved documents against the question.
+
+        Args:
+            question: User's question
+            documents: Retrieved LangChain Documents
+
+        Returns:
+            List of dicts with text, score, doc_index and position, in document order
+        """
+        scored = []
+        for doc_index, doc in enumerate(documents):
+            for position, sentence in enumerate(self.split_sentences(doc.page_content)):
+                scored.append({
+                    "text": sentence,
+                    "doc_index": doc_index,
+                    "position": position,
+                    "metadata": doc.metadata,
+                })
+        if not scored:
+            return []
+
+        sentence_vectors = self._embed_sentences([s["text"] for s in scored])
+        question_vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+
+        # Cosine similarity
+        norms = np.linalg.norm(sentence_vectors, axis=1) * (np.linalg.norm(question_vector) or 1.0)
+        scores = sentence_vectors @ question_vector / np.where(norms == 0, 1.0, norms)
+        for sentence, score in zip(scored, scores):
+            sentence["score"] = float(score)
+        return scored
+
+    def select(self, question, documents, token_budget=None):
+        """Return the top-scoring sentences that fit the budget, in document order."""
+        budget = token_budget or self.token_budget
+        scored = self.score_sentences(question, documents)
+
+        selected = []
+        used = 0
+        for sentence in sorted(scored, key=lambda s: s["score"], reverse=True):
+            cost = estimate_tokens(sentence["text"])
+            if used + cost > budget:
+                continue
+            selected.append(sentence)
+            used += cost
+
+        selected.sort(key=lambda s: (s["doc_index"], s["position"]))
+        return selected
+
+    def compress(self, question, documents, token_budget=None):
+        """
+        Build a compressed context string for the question.
+
+        Sentences from the same chunk are joined with spaces; chunks are
+        separated by blank lines, matching the uncompressed context layout.
+        """
+        paragraphs = []
+        current_doc = None
+        for sentence in self.select(question, documents, token_budget):
+            if sentence["doc_index"] != current_doc:
+                paragraphs.append([])
+                current_doc = sentence["doc_index"]
+            paragraphs[-1].append(sentence["text"])
+        return "\n\n".join(" ".join(p) for p in paragraphs)
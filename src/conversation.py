@@ -0,0 +1,193 @@
+"""Conversation-aware retrieval for follow-up questions.
+
+A follow-up like "what about for protégés?" says little on its own. For
+follow-ups, RAGSystem.retrieve_in_conversation searches with the current
+question's embedding plus a weighted share of the previous turn's query
+vector, which is cached, so no earlier turn is re-embedded. The previous
+turn's chunks, cached with their vectors, are re-scored against the new
+query and compete with the fresh hits. A follow-up therefore costs one
+embedding, the same as a new question.
+
+Compare isolated and conversation-aware recall on scripted follow-ups:
+    python conversation.py --index ../data/faiss_index
+"""
+import argparse
+import re
+import sys
+import io
+from collections import deque
+import numpy as np
+from local_answerer import content_words
+from metrics import metrics
+
+# Share of the previous query vector mixed into a follow-up's query
+HISTORY_WEIGHT = 0.5
+MAX_TURNS = 4
+# Questions this short with a back-reference are treated as follow-ups
+FOLLOW_UP_MAX_WORDS = 8
+FOLLOW_UP_OPENER = re.compile(r"^\s*(and|also|what about|how about|what if|same for|then)\b", re.IGNORECASE)
+BACK_REFERENCE = re.compile(r"\b(it|its|they|them|their|this|that|these|those|he|she)\b", re.IGNORECASE)
+# Questions with nothing of their own to search for
+ELLIPSIS = re.compile(r"^\s*(why|how so|how come|what else|anything else|such as|for example|like what)\W*$",
+                      re.IGNORECASE)
+
+
+def is_follow_up(question):
+    """
+    Whether a question leans on the previous turn.
+
+    Only explicit cues count: an opener such as "and" or "what about", a
+    pronoun or demonstrative pointing back, or no terms of its own. A short
+    self-contained question ("What is DFARS?") starts a new topic.
+    """
+    if FOLLOW_UP_OPENER.search(question) or ELLIPSIS.match(question):
+        return True
+    if len(question.split()) > FOLLOW_UP_MAX_WORDS:
+        return False
+    return bool(BACK_REFERENCE.search(question)) or not content_words(question)
+
+
+class Conversation:
+    """Recent turns of one chat session with their cached query vectors and chunks."""
+
+    def __init__(self, history_weight=HISTORY_WEIGHT, max_turns=MAX_TURNS):
+        """
+        Initialize an empty conversation.
+
+        Args:
+            history_weight: Share of the previous query vector in a follow-up's query
+            max_turns: Turns kept; older ones are dropped
+        """
+        self.history_weight = history_weight
+        self.turns = deque(maxlen=max_turns)
+
+    @property
+    def last(self):
+        return self.turns[-1] if self.turns else None
+
+    def record(self, question, query_vector, hits, version):
+        """
+        Remember a turn.
+
+        Args:
+            question: The question as asked
+            query_vector: Vector that was searched (None if not embedded, e.g. a FAQ hit)
+            hits: (Document, score, chunk vector) tuples retrieved for it
+            version: RAGSystem.index_version the hits belong to
+        """
+        self.turns.append({
+            "question": question,
+            "query_vector": query_vector,
+            "hits": hits,
+            "version": version,
+        })
+
+    def query_vector(self, vector, previous):
+        """Follow-up query: the question's vector plus a share of the previous query, unit length."""
+        query = vector + self.history_weight * previous["query_vector"]
+        norm = np.linalg.norm(query)
+        return query / norm if norm else vector
+
+    @staticmethod
+    def merge(query, hits, candidates, k):
+        """Top k of fresh hits and re-scored earlier chunks, each chunk once."""
+        merged = {}
+        rescored = [
+            (doc, float(np.sum((query - vector) ** 2)), vector)
+            for doc, _, vector in candidates
+        ]
+        for hit in list(hits) + rescored:
+            key = hit[0].id or hit[0].page_content
+            if key not in merged or hit[1] < merged[key][1]:
+                merged[key] = hit
+        return sorted(merged.values(), key=lambda hit: hit[1])[:k]
+
+    def clear(self):
+        self.turns.clear()
+
+    def __len__(self):
+        return len(self.turns)
+
+
+# Scripted follow-ups: (opening golden question id, follow-up, golden id the follow-up means)
+FOLLOW_UPS = [
+    ("mentor-eligibility", "What about for protégés?", "protege-eligibility"),
+    ("protege-eligibility", "And who selects them?", "protege-selection"),
+    ("annual-review", "And the semi-annual reports?", "semi-annual-reports"),
+    ("agreement-types", "How long can they last?", "agreement-term"),
+    ("mentor-approval", "What if the company is debarred?", "debarred-mentor"),
+    ("reimbursement-limit", "How are unreimbursed costs credited?", "credit-unreimbursed"),
+    ("kickoff", "What happens after that each quarter?", "quarterly-reviews"),
+    ("budget", "How often is it invoiced?", "invoicing"),
+]
+
+
+def evaluate(rag, golden, follow_ups=FOLLOW_UPS):
+    """
+    Recall of the follow-up's expected pages, asked alone versus in conversation.
+
+    Returns:
+        Dict with isolated and conversational hit counts and query embeddings per follow-up
+    """
+    by_id = {q["id"]: q for q in golden}
+
+    def hit(docs, expected):
+        pages = {(e["source_file"], e["page"]) for e in expected}
+        return any((d.metadata.get("source_file"), d.metadata.get("page")) in pages for d in docs)
+
+    def embeds():
+        counters = metrics.to_dict()["counters"]
+        return counters.get("embedder_queries", 0) + counters.get("micro_batched_queries", 0)
+
+    result = {"follow_ups": len(follow_ups), "isolated": 0, "conversation": 0, "rows": []}
+    isolated_embeds = conversation_embeds = 0
+    for opener, follow_up, target in follow_ups:
+        expected = by_id[target]["expected"]
+
+        before = embeds()
+        isolated = hit(rag.retrieve(follow_up), expected)
+        isolated_embeds += embeds() - before
+
+        conversation = Conversation()
+        rag.retrieve_in_conversation(by_id[opener]["question"], conversation)
+        before = embeds()
+        aware = hit(rag.retrieve_in_conversation(follow_up, conversation), expected)
+        conversation_embeds += embeds() - before
+
+        result["isolated"] += isolated
+        result["conversation"] += aware
+        result["rows"].append((follow_up, isolated, aware))
+    result["isolated_embeds"] = isolated_embeds / max(1, len(follow_ups))
+    result["conversation_embeds"] = conversation_embeds / max(1, len(follow_ups))
+    return result
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Compare isolated and conversation-aware follow-up retrieval")
+    parser.add_argument("--index", default="../data/faiss_index", help="Index location")
+    parser.add_argument("--golden", help="Golden questions JSON")
+    args = parser.parse_args()
+
+    from rag_system import RAGSystem
+    from benchmark import DEFAULT_GOLDEN, load_golden
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    metrics.reset()
+    result = evaluate(rag, load_golden(args.golden or DEFAULT_GOLDEN))
+
+    print(f"\n{'Follow-up':<40} {'Alone':>6} {'In conversation':>16}")
+    for follow_up, isolated, aware in result["rows"]:
+        print(f"{follow_up:<40} {'hit' if isolated else '-':>6} {'hit' if aware else '-':>16}")
+    n = result["follow_ups"]
+    print(f"\nRecall: alone {result['isolated']}/{n}, in conversation {result['conversation']}/{n}")
+    print(f"Query embeddings per follow-up: alone {result['isolated_embeds']:.1f}, "
+          f"in conversation {result['conversation_embeds']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Near-duplicate chunk detection with MinHash + LSH.
+
+The training modules repeat large blocks of SOP text, so many chunks are
+near-identical. This stage runs between PDFProcessor.chunk_documents and
+RAGSystem.build_vector_store and keeps one chunk per near-duplicate group,
+recording every source it appeared in under metadata["duplicate_sources"].
+
+Compare index size and build time with and without dedup:
+    python dedup.py "../../Core Documents" "../../Modules"
+"""
+import argparse
+import re
+import sys
+import io
+import time
+import zlib
+import numpy as np
+from langchain_core.documents import Document
+from metrics import metrics
+
+WORD = re.compile(r"\w+")
+# Mersenne prime for the universal hash family
+PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+class ChunkDeduplicator:
+    """Collapses near-duplicate chunks into one, keeping all citations."""
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=8, shingle_size=5, seed=1):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            threshold: Estimated Jaccard similarity at which chunks are merged
+            num_perm: Number of MinHash permutations
+            bands: LSH bands (num_perm must be divisible by bands)
+            shingle_size: Words per shingle
+            seed: Seed for the hash permutations (fixed for reproducible builds)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text):
+        words = WORD.findall(text.lower())
+        size = self.shingle_size
+        if len(words) <= size:
+            return {zlib.crc32(" ".join(words).encode("utf-8"))}
+        return {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(len(words) - size + 1)
+        }
+
+    def signature(self, text):
+        """MinHash signature of a text as a uint64 array of length num_perm."""
+        shingles = np.fromiter(self._shingles(text), dtype=np.uint64)
+        hashes = (np.outer(shingles, self._a) + self._b) % PRIME & MAX_HASH
+        return hashes.min(axis=0)
+
+    def dedupe(self, chunks):
+        """
+        Collapse near-duplicate chunks.
+
+        Args:
+            chunks: LangChain Documents from PDFProcessor.chunk_documents
+
+        Returns:
+            List of kept Documents, in original order; merged chunks are
+            copies carrying metadata["duplicate_sources"], the input is unchanged
+        """
+        start = time.perf_counter()
+        with metrics.span("dedup", chunks=len(chunks)):
+            signatures = [self.signature(chunk.page_content) for chunk in chunks]
+
+            # Union-find over candidate pairs from LSH buckets
+            parent = list(range(len(chunks)))
+
+            def find(i):
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
+            for band in range(self.bands):
+                buckets = {}
+                lo, hi = band * self.rows, (band + 1) * self.rows
+                for i, sig in enumerate(signatures):
+                    buckets.setdefault(sig[lo:hi].tobytes(), []).append(i)
+                for members in buckets.values():
+                    # Every candidate pair, so A~C is found even if neither is like members[0]
+                    for pos, a in enumerate(members):
+                        for b in members[pos + 1:]:
+                            root_a, root_b = find(a), find(b)
+                            if root_a == root_b:
+                                continue
+                            similarity = np.mean(signatures[a] == signatures[b])
+                            if similarity >= self.threshold:
+                                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+            groups = {}
+            for i in range(len(chunks)):
+                groups.setdefault(find(i), []).append(i)
+
+            kept = []
+            for root in sorted(groups):
+                members = groups[root]
+                chunk = chunks[root]
+                if len(members) > 1:
+                    sources = []
+                    for i in members:
+                        source = {
+                            "source_file": chunks[i].metadata.get("source_file", "unknown"),
+                            "page": chunks[i].metadata.get("page", "?"),
+                            # Full path, so incremental updates know every file that holds the text
+                            "source": chunks[i].metadata.get("source", ""),
+                        }
+                        if source not in sources:
+                            sources.append(source)
+                    # Copy rather than annotate the caller's chunk in place
+                    chunk = Document(
+                        page_content=chunk.page_content,
+                        metadata={**chunk.metadata, "duplicate_sources": sources},
+                        id=chunk.id,
+                    )
+                kept.append(chunk)
+
+        elapsed = time.perf_counter() - start
+        removed = len(chunks) - len(kept)
+        metrics.inc("duplicate_chunks_removed", removed)
+        shrink = removed / len(chunks) * 100 if chunks else 0.0
+        print(f"Deduplicated {len(chunks)} chunks -> {len(kept)} "
+              f"({removed} near-duplicates removed, {shrink:.1f}% smaller) in {elapsed:.2f}s")
+        return kept
+
+
+def compare_builds(folders):
+    """Build the index with and without dedup and report vectors, size and time."""
+    from pdf_processor import PDFProcessor
+    from rag_system import RAGSystem
+
+    processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
+    chunks = processor.chunk_documents(processor.extract_pdfs(folders))
+    rag = RAGSystem(use_openai=False)
+
+    report = {}
+    for mode in ("baseline", "dedup"):
+        start = time.perf_counter()
+        docs = ChunkDeduplicator().dedupe(list(chunks)) if mode == "dedup" else chunks
+        rag.build_vector_store(docs)
+        index = rag.vector_store.index
+        report[mode] = {
+            "vectors": index.ntotal,
+            "index_mb": index.ntotal * index.d * 4 / 1e6,
+            "build_s": time.perf_counter() - start,
+        }
+    return report
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Compare index builds with and without dedup")
+    parser.add_argument("folders", nargs="+", help="Folders containing PDFs")
+    args = parser.parse_args()
+
+    report = compare_builds(args.folders)
+    print(f"\n{'mode':<10} {'vectors':>8} {'index MB':>10} {'build s':>10}")
+    for mode, row in report.items():
+        print(f"{mode:<10} {row['vectors']:>8} {row['index_mb']:>10.2f} {row['build_s']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""Acronym lexicon built at ingest and used to expand queries.
+
+The SOP defines its acronyms inline, e.g. "Defense Contract Management Agency
+(DCMA)", and then uses either form. A question in one form embeds far from a
+chunk written in the other. When the index is built, each chunk is scanned
+for "Long Form (ACR)" definitions, keeping the ones whose words start with
+the acronym's letters. The scan also counts how many chunks use each
+acronym. The lexicon is saved with the index as lexicon.json.
+
+Before a question is embedded, each acronym in it gains its long form, and
+each long form gains its acronym:
+    "What does DCMA do?" -> "What does DCMA do? (Defense Contract Management Agency)"
+Lookups are dictionary hits per question word, so the cost does not grow
+with the corpus. Acronyms used in most chunks (DoD, MPP) are not expanded;
+they don't single out any passage and would only dilute the query.
+
+Measure recall with and without expansion on the golden questions and their
+abbreviated / spelled-out variants:
+    python lexicon.py --index ../data/faiss_index
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import io
+import time
+import unicodedata
+from functools import lru_cache
+from metrics import metrics
+
+LEXICON_NAME = "lexicon.json"
+# Acronyms in more than this share of chunks are not expanded
+MAX_DF_RATIO = 0.5
+
+# "(DCMA)", "(MPAs)", "(DoD)": at least two capitals, optional plural s
+DEFINED_ACRONYM = re.compile(r"\(\s*([A-Z][A-Za-z&]{1,9})\s*\)")
+# Acronym-like words in running text
+ACRONYM_WORD = re.compile(r"\b[A-Za-z]*[A-Z][A-Za-z&]*[A-Z][A-Za-z]*\b")
+WORD = re.compile(r"[^\W_]+(?:['’][^\W_]+)?")
+# Words a long form may contain without a letter in the acronym
+JOINING_WORDS = {"of", "and", "the", "for", "on", "in", "to", "a", "an", "or", "with", "by"}
+# Text before "(ACR)" searched for its long form
+DEFINITION_WINDOW = 200
+
+
+def acronym_key(word):
+    """Lexicon key of an acronym: upper case, plural s dropped ("MPAs" -> "MPA")."""
+    if len(word) > 2 and word.endswith("s") and not word[:-1].islower():
+        word = word[:-1]
+    return word.upper()
+
+
+@lru_cache(maxsize=8192)
+def normalize_word(word):
+    """Accent-, case- and plural-insensitive form of a word ("Protégés" -> "protege")."""
+    word = unicodedata.normalize("NFKD", word)
+    word = "".join(c for c in word if not unicodedata.combining(c)).lower()
+    word = re.sub(r"['’]s$", "", word)
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def normalize_phrase(text):
+    return tuple(normalize_word(w) for w in WORD.findall(text))
+
+
+def _align(words, letters):
+    """
+    First word of a run ending at words[-1] whose initials spell letters, or None.
+
+    Joining words are skipped where possible and used for a letter only when
+    needed ("Return on Investment" for ROI, but "Office of ..." for OSBP).
+    """
+    if not words:
+        return None
+    word = words[-1]
+    joining = word.group().lower() in JOINING_WORDS
+    if joining:
+        first = _align(words[:-1], letters)
+        if first is not None:
+            return first
+    if word.group()[0].upper() == letters[-1]:
+        return word if len(letters) == 1 else _align(words[:-1], letters[:-1])
+    return None
+
+
+def find_definitions(text):
+    """
+    (acronym, long form) pairs defined in a text as "Long Form (ACR)".
+
+    The long form is the run of words before the parenthesis whose initials
+    spell the acronym's capitals in order; joining words such as
+    "of" may sit in between ("Office of Small Business Programs (OSBP)").
+    """
+    definitions = []
+    for match in DEFINED_ACRONYM.finditer(text):
+        acronym = match.group(1)
+        letters = [c for c in acronym if c.isupper()]
+        if len(letters) < 2:
+            continue
+        window_start = max(0, match.start() - DEFINITION_WINDOW)
+        first = _align(list(WORD.finditer(text, window_start, match.start())), letters)
+        if first is None:
+            continue
+        long_form = " ".join(text[first.start():match.start()].split()).rstrip(" ,;:")
+        definitions.append((acronym_key(acronym), long_form))
+    return definitions
+
+
+class Lexicon:
+    """Acronym definitions and per-chunk acronym counts for one index."""
+
+    def __init__(self):
+        # acronym -> {long form: times defined}
+        self.definitions = {}
+        # acronym -> chunks using it
+        self.df = {}
+        self.chunks = 0
+        self._refresh()
+
+    def add_documents(self, documents):
+        """Count definitions and acronym use in newly indexed chunks."""
+        self._count(documents, 1)
+
+    def remove_documents(self, documents):
+        """Undo add_documents for chunks deleted from the index."""
+        self._count(documents, -1)
+
+    def _count(self, documents, sign):
+        for doc in documents:
+            text = doc.page_content
+            self.chunks += sign
+            for acronym, long_form in find_definitions(text):
+                forms = self.definitions.setdefault(acronym, {})
+                # Merge spellings that differ only in case, accents or plural
+                key = normalize_phrase(long_form)
+                long_form = next((f for f in forms if normalize_phrase(f) == key), long_form)
+                forms[long_form] = forms.get(long_form, 0) + sign
+                if forms[long_form] <= 0:
+                    del forms[long_form]
+                if not forms:
+                    del self.definitions[acronym]
+            for acronym in {acronym_key(w) for w in ACRONYM_WORD.findall(text)}:
+                self.df[acronym] = self.df.get(acronym, 0) + sign
+                if self.df[acronym] <= 0:
+                    del self.df[acronym]
+        self._refresh()
+
+    def long_form(self, acronym):
+        """Most often defined long form of an acronym, or None."""
+        forms = self.definitions.get(acronym)
+        return max(forms, key=forms.get) if forms else None
+
+    def _refresh(self):
+        """Rebuild the lookup tables expand() reads; they are swapped in whole."""
+        expansions, phrases = {}, {}
+        for acronym in self.definitions:
+            if self.df.get(acronym, 0) > MAX_DF_RATIO * self.chunks:
+                continue
+            long_form = self.long_form(acronym)
+            expansions[acronym] = long_form
+            phrases[normalize_phrase(long_form)] = acronym
+        self._expansions = expansions
+        self._phrases = phrases
+        self._phrase_lengths = sorted({len(p) for p in phrases}, reverse=True)
+
+    def expand(self, query):
+        """
+        The query with the other form of each acronym or long form it contains.
+
+        Returns the query unchanged if it has nothing to expand.
+        """
+        expansions, phrases, lengths = self._expansions, self._phrases, self._phrase_lengths
+        words = WORD.findall(query)
+        normalized = tuple(normalize_word(w) for w in words)
+        present = {acronym_key(w) for w in words}
+        additions = []
+
+        i = 0
+        while i < len(normalized):
+            for n in lengths:
+                acronym = phrases.get(normalized[i:i + n])
+                if acronym:
+                    if acronym not in present:
+                        additions.append(acronym)
+                        present.add(acronym)
+                    # Longest match wins; "Office of Small Business Programs" is not also SBP
+                    i += n
+                    break
+            else:
+                i += 1
+
+        normalized_query = " ".join(normalized)
+        for word in words:
+            # Lower-case words are only taken for acronyms when long enough not to be ordinary words
+            if not (ACRONYM_WORD.fullmatch(word) or (word.islower() and len(word) >= 4)):
+                continue
+            acronym = word.upper() if word.upper() in expansions else acronym_key(word)
+            long_form = expansions.get(acronym)
+            if long_form and long_form not in additions \
+                    and " ".join(normalize_phrase(long_form)) not in normalized_query:
+                additions.append(long_form)
+
+        if not additions:
+            return query
+        metrics.inc("queries_expanded")
+        return f"{query} ({'; '.join(additions)})"
+
+    def to_dict(self):
+        return {"chunks": self.chunks, "definitions": self.definitions, "df": self.df}
+
+    @classmethod
+    def from_dict(cls, data):
+        lexicon = cls()
+        lexicon.chunks = data["chunks"]
+        lexicon.definitions = data["definitions"]
+        lexicon.df = data["df"]
+        lexicon._refresh()
+        return lexicon
+
+    def save(self, index_path):
+        with open(os.path.join(index_path, LEXICON_NAME), "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, index_path):
+        """The lexicon saved with an index, or None for indexes built without one."""
+        path = os.path.join(index_path, LEXICON_NAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def __len__(self):
+        return len(self.definitions)
+
+
+def rewrite(lexicon, question, abbreviate):
+    """A question with its long forms abbreviated, or its acronyms spelled out."""
+    # Longest first, so "Mentor-Protégé Agreement" becomes MPA rather than "MP Agreement"
+    for acronym, long_form in sorted(lexicon._expansions.items(), key=lambda item: -len(item[1])):
+        if abbreviate:
+            words = WORD.findall(long_form)
+            words[-1] = re.sub(r"(?<!s)s$", "", words[-1])
+            pattern = r"\b" + r"[\s-]+".join(re.escape(w) for w in words) + r"(s?)\b"
+            question = re.sub(pattern, lambda m: acronym + m.group(1), question, flags=re.IGNORECASE)
+        else:
+            question = re.sub(rf"\b{re.escape(acronym)}(s?)\b", lambda m: long_form + m.group(1), question)
+    return question
+
+
+def evaluate(rag, golden, k=8):
+    """
+    Recall of the golden questions and their acronym variants, with and without expansion.
+
+    Each question is asked as written, with its long forms abbreviated and
+    with its acronyms spelled out (variants identical to the original are
+    skipped). A variant counts as a hit if any expected page is in the top k.
+
+    Returns:
+        Dict with the variant count, hits per mode, the expanded share and
+        the median expansion and query embedding times in ms
+    """
+    lexicon = rag.lexicon
+    asked = []
+    for item in golden:
+        pages = {(e["source_file"], e["page"]) for e in item["expected"]}
+        for question in dict.fromkeys([
+            item["question"],
+            rewrite(lexicon, item["question"], abbreviate=True),
+            rewrite(lexicon, item["question"], abbreviate=False),
+        ]):
+            asked.append((question, pages))
+
+    def hits(texts):
+        vectors = rag.embeddings.embed_documents(texts)
+        results = rag.search_batch(vectors, k=k)
+        return [
+            any((d.metadata.get("source_file"), d.metadata.get("page")) in pages for d, _ in found)
+            for found, (_, pages) in zip(results, asked)
+        ]
+
+    def median_ms(fn, items):
+        times = []
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            times.append((time.perf_counter() - start) * 1000)
+        return sorted(times)[len(times) // 2]
+
+    questions = [q for q, _ in asked]
+    expanded = [lexicon.expand(q) for q in questions]
+    plain_hits = hits(questions)
+    expanded_hits = hits(expanded)
+    return {
+        "variants": len(asked),
+        "expanded": sum(e != q for e, q in zip(expanded, questions)),
+        "plain": sum(plain_hits),
+        "with_expansion": sum(expanded_hits),
+        "rows": list(zip(questions, expanded, plain_hits, expanded_hits)),
+        "expand_ms": median_ms(lexicon.expand, questions * 20),
+        "embed_ms": median_ms(rag.embeddings.embed_query, questions),
+    }
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Show the acronym lexicon and measure query expansion")
+    parser.add_argument("--index", default="../data/faiss_index", help="Index location")
+    parser.add_argument("--golden", help="Golden questions JSON")
+    parser.add_argument("-k", type=int, default=8, help="Chunks searched per question")
+    parser.add_argument("--list", action="store_true", help="Print every acronym and its long form")
+    args = parser.parse_args()
+
+    from rag_system import RAGSystem
+    from benchmark import DEFAULT_GOLDEN, load_golden
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    lexicon = rag.lexicon
+    print(f"\n{len(lexicon)} acronyms defined, {len(lexicon._expansions)} expanded, "
+          f"across {lexicon.chunks} chunks")
+    if args.list:
+        for acronym in sorted(lexicon.definitions):
+            skipped = "" if acronym in lexicon._expansions else "  (in most chunks, not expanded)"
+            print(f"  {acronym:<8} {lexicon.long_form(acronym)}  [{lexicon.df.get(acronym, 0)} chunks]{skipped}")
+
+    result = evaluate(rag, load_golden(args.golden or DEFAULT_GOLDEN), k=args.k)
+    print(f"\n{'Question':<70} {'Plain':>6} {'Expanded':>9}")
+    for question, expanded, plain, with_expansion in result["rows"]:
+        marker = "*" if expanded != question else " "
+        print(f"{marker}{question[:69]:<69} {'hit' if plain else '-':>6} {'hit' if with_expansion else '-':>9}")
+    n = result["variants"]
+    print(f"\n{result['expanded']}/{n} questions expanded (*)")
+    print(f"Hit@{args.k}: plain {result['plain']}/{n}, with expansion {result['with_expansion']}/{n}")
+    print(f"Expansion {result['expand_ms'] * 1000:.0f} us per question "
+          f"vs {result['embed_ms']:.1f} ms to embed it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Persistent LLM response cache with in-flight request de-duplication."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from metrics import metrics
+
+# Bump when PROMPT_TEMPLATE changes so old cached answers are not reused
+PROMPT_TEMPLATE_VERSION = 1
+PROMPT_TEMPLATE = """You are a helpful assistant for the DoD Mentor-Protégé Program.
+                            Use the following context to answer the question. Be specific and cite relevant details.
+
+                            Context:
+                            {context}
+
+                            Question: {question}
+
+                            Answer:"""
+
+
+def chunk_id(doc):
+    """Stable ID for a retrieved chunk (docstore ID if present, else a content hash)."""
+    if getattr(doc, "id", None):
+        return str(doc.id)
+    source = f"{doc.metadata.get('source_file', '')}|{doc.metadata.get('page', '')}|{doc.page_content}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+def make_cache_key(model, template_version, question, chunk_ids):
+    """Hash (model, template version, question, retrieved chunk IDs) into a cache key."""
+    payload = json.dumps([model, template_version, question.strip(), list(chunk_ids)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL, LRU size limit and single-flight."""
+
+    def __init__(self, path="./data/llm_cache.sqlite3", ttl_seconds=7 * 24 * 3600, max_entries=1000):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file to persist responses in
+            ttl_seconds: Entries older than this are treated as missing
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT, created REAL, last_used REAL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired."""
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key):
+        """get() for callers holding the lock."""
+        now = time.time()
+        row = self._db.execute(
+            "SELECT response, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        response, created = row
+        if now - created > self.ttl_seconds:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        return response
+
+    def put(self, key, response):
+        """Store a response and evict least recently used entries over the limit."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached response for key, calling compute() on a miss.
+
+        Concurrent callers with the same key share one compute() call: the
+        first caller runs it and the others wait for its result.
+        """
+        # The cache and the in-flight map are checked under one lock, so a
+        # caller cannot miss both between the owner's put() and its pop()
+        with self._lock:
+            future = self._in_flight.get(key)
+            response = None if future is not None else self._lookup(key)
+            owner = future is None and response is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.hits += 1
+
+        if response is not None:
+            metrics.inc("llm_cache_hits")
+            return response
+        if not owner:
+            metrics.inc("llm_cache_hits")
+            metrics.inc("llm_requests_deduplicated")
+            return future.result()
+
+        metrics.inc("llm_cache_misses")
+        try:
+            response = compute()
+            self.put(key, response)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+
+class CachedOpenAIAnswerer:
+    """Answers questions with an OpenAI-compatible chat model through the cache."""
+
+    def __init__(self, cache, model="gpt-4", base_url=None):
+        """
+        Initialize the answerer.
+
+        Args:
+            cache: LLMResponseCache shared by all sessions
+            model: Chat model name
+            base_url: API base URL (defaults to OPENAI_BASE_URL, e.g. a local mock server)
+        """
+        self.cache = cache
+        self.model = model
+        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+
+    def _call_llm(self, question, context):
+        from langchain_openai import ChatOpenAI
+
+        llm = ChatOpenAI(model=self.model, temperature=0, base_url=self.base_url)
+        prompt = PROMPT_TEMPLATE.format(context=context, question=question)
+        return llm.invoke(prompt).content
+
+    def answer(self, question, context, documents):
+        """
+        Answer from context, reusing a cached response when the same question
+        was asked over the same retrieved chunks.
+        """
+        key = make_cache_key(
+            self.model, PROMPT_TEMPLATE_VERSION, question, [chunk_id(doc) for doc in documents]
+        )
+        return self.cache.get_or_compute(key, lambda: self._call_llm(question, context))
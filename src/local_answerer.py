@@ -0,0 +1,205 @@
+"""Extractive answer engine for offline use (no API key, CPU only).
+
+Ranks sentences of the retrieved chunks, extracts the most relevant span of
+each top sentence and cites the source file and page it came from.
+
+Benchmark:
+    python local_answerer.py --index ../data/faiss_index --target-ms 250
+"""
+import argparse
+import re
+import sys
+import io
+import time
+
+# Words that carry no meaning for matching a question to a sentence
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i in is it my of on or
+should that the their there these this to under was what when where which
+who why will with about me tell
+""".split())
+WORD = re.compile(r"[A-Za-z0-9]+")
+CLAUSE_BOUNDARY = re.compile(r"(?<=[;:])\s+|,\s+(?=(?:and|but|or|which|including)\b)")
+
+DEFAULT_QUESTIONS = [
+    "What are the eligibility requirements for mentors?",
+    "How do I report financial data?",
+    "What are the roles and responsibilities?",
+    "Tell me about subcontracting requirements",
+    "What is the agreement approval process?",
+]
+
+
+def content_words(text):
+    return {w for w in WORD.findall(text.lower()) if w not in STOPWORDS}
+
+
+class ExtractiveAnswerer:
+    """Builds a cited answer from the best sentences of the retrieved chunks."""
+
+    def __init__(self, compressor, max_sentences=3, relative_cutoff=0.75,
+                 max_span_chars=300, lexical_weight=0.3):
+        """
+        Initialize the answerer.
+
+        Args:
+            compressor: ContextCompressor used for sentence splitting and scoring
+            max_sentences: Maximum sentences in the answer
+            relative_cutoff: Drop sentences scoring below this fraction of the best
+            max_span_chars: Longer sentences are trimmed to their best clause span
+            lexical_weight: Weight of question-word overlap added to the embedding score
+        """
+        self.compressor = compressor
+        self.max_sentences = max_sentences
+        self.relative_cutoff = relative_cutoff
+        self.max_span_chars = max_span_chars
+        self.lexical_weight = lexical_weight
+
+    def rank_sentences(self, question, documents):
+        """Score sentences by embedding similarity plus question-word overlap."""
+        question_words = content_words(question)
+        ranked = self.compressor.score_sentences(question, documents)
+        for sentence in ranked:
+            if question_words:
+                overlap = len(question_words & content_words(sentence["text"])) / len(question_words)
+                sentence["score"] += self.lexical_weight * overlap
+        ranked.sort(key=lambda s: s["score"], reverse=True)
+        return ranked
+
+    def extract_span(self, question, sentence):
+        """Trim a long sentence to the contiguous clauses that best match the question."""
+        if len(sentence) <= self.max_span_chars:
+            return sentence
+
+        clauses = CLAUSE_BOUNDARY.split(sentence)
+        question_words = content_words(question)
+        best_span, best_hits = clauses[0], -1
+        for start in range(len(clauses)):
+            span = clauses[start]
+            for end in range(start, len(clauses)):
+                if end > start:
+                    if len(span) + 1 + len(clauses[end]) > self.max_span_chars:
+                        break
+                    span = f"{span} {clauses[end]}"
+                hits = len(question_words & content_words(span))
+                if hits > best_hits:
+                    best_span, best_hits = span, hits
+
+        if len(best_span) > self.max_span_chars:
+            best_span = best_span[:self.max_span_chars].rsplit(" ", 1)[0] + "..."
+        return best_span
+
+    def answer(self, question, documents):
+        """
+        Answer a question from retrieved documents.
+
+        Args:
+            question: User's question
+            documents: Retrieved LangChain Documents
+
+        Returns:
+            Dict with answer text, citations list and elapsed_ms
+        """
+        start = time.perf_counter()
+        ranked = self.rank_sentences(question, documents)
+
+        picked = []
+        seen = set()
+        for sentence in ranked:
+            if picked and sentence["score"] < ranked[0]["score"] * self.relative_cutoff:
+                break
+            # Chunk overlap repeats sentences across neighbouring chunks
+            key = sentence["text"].lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            picked.append(sentence)
+            if len(picked) == self.max_sentences:
+                break
+
+        citations = []
+        lines = []
+        for sentence in picked:
+            source = (sentence["metadata"].get("source_file", "unknown"),
+                      sentence["metadata"].get("page", "?"))
+            if source not in citations:
+                citations.append(source)
+            marker = citations.index(source) + 1
+            lines.append(f"{self.extract_span(question, sentence['text'])} [{marker}]")
+
+        return {
+            "answer": " ".join(lines),
+            "citations": [{"source_file": f, "page": p} for f, p in citations],
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+
+    def format_answer(self, result):
+        """Render an answer dict as text with a numbered source list."""
+        if not result["answer"]:
+            return "No relevant passages were found in the retrieved documents."
+        sources = "\n".join(
+            f"[{i}] {c['source_file']} (Page {c['page']})"
+            for i, c in enumerate(result["citations"], 1)
+        )
+        return f"{result['answer']}\n\nSources:\n{sources}"
+
+
+def benchmark(rag, questions, runs=5, target_ms=250):
+    """
+    Measure per-query latency of the extractive answer step.
+
+    Retrieval is done once per question so only answer generation is timed.
+
+    Returns:
+        Dict with p50/p95/max latency in ms and whether p95 meets the target
+    """
+    retrieved = [(q, rag.retrieve(q)) for q in questions]
+    # Warm the sentence embedding cache the way a running server would be
+    for question, docs in retrieved:
+        rag.answerer.answer(question, docs)
+
+    timings = []
+    for _ in range(runs):
+        for question, docs in retrieved:
+            timings.append(rag.answerer.answer(question, docs)["elapsed_ms"])
+    timings.sort()
+
+    p50 = timings[len(timings) // 2]
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return {
+        "queries": len(timings),
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "max_ms": timings[-1],
+        "target_ms": target_ms,
+        "meets_target": p95 <= target_ms,
+    }
+
+
+def main():
+    from rag_system import RAGSystem
+
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Benchmark the offline extractive answerer")
+    parser.add_argument("questions", nargs="*", help="Questions (defaults to the example set)")
+    parser.add_argument("--index", default="../data/faiss_index", help="Path to the FAISS index")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per question")
+    parser.add_argument("--target-ms", type=float, default=250, help="p95 latency target")
+    args = parser.parse_args()
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    result = benchmark(rag, args.questions or DEFAULT_QUESTIONS, args.runs, args.target_ms)
+
+    print(f"\nQueries timed: {result['queries']}")
+    print(f"p50: {result['p50_ms']:.1f} ms  p95: {result['p95_ms']:.1f} ms  max: {result['max_ms']:.1f} ms")
+    status = "MET" if result["meets_target"] else "MISSED"
+    print(f"Target p95 <= {result['target_ms']:.0f} ms: {status}")
+    sys.exit(0 if result["meets_target"] else 1)
+
+
+if __name__ == "__main__":
+    main()
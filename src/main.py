@@ -1,16 +1,31 @@
 """Main script to run the RAG system."""
+import argparse
+import atexit
 import os
 import sys
 import io
 from pathlib import Path
 from pdf_processor import PDFProcessor
 from rag_system import RAGSystem
+from dedup import ChunkDeduplicator
+from profiling import enable_profiling
 
 # Fix encoding issues on Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the DoD MPP index and query it interactively")
+    parser.add_argument("--profile", nargs="?", const="./profiles", metavar="DIR",
+                        help="Profile each stage and write reports to DIR (default ./profiles)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    if args.profile:
+        # Reports are written on exit, after the build and any queries
+        atexit.register(enable_profiling(args.profile).write_reports)
+
     # Define document folders
     core_docs_path = "../../Core Documents"
     modules_path = "../../Modules"
@@ -27,9 +42,11 @@ def main():
     print("=" * 60)
     print("STEP 1: Processing PDFs")
     print("=" * 60)
-    processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
+    # Unchanged PDFs are read from the page cache instead of being re-parsed
+    processor = PDFProcessor(chunk_size=1000, chunk_overlap=200, page_cache="./data/page_cache.sqlite3")
     documents = processor.extract_pdfs([core_docs_path, modules_path])
     chunks = processor.chunk_documents(documents)
+    chunks = ChunkDeduplicator().dedupe(chunks)
 
     # Step 2: Build RAG System
     print("\n" + "=" * 60)
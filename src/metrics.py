@@ -0,0 +1,144 @@
+"""Per-stage timing spans and counters, exported as Prometheus text or JSON.
+
+Instrumented stages: extract, split, dedup, embed, index_add, query_embed,
+search, rerank, generate. Counters track chunks processed and cache hits.
+
+    from metrics import metrics
+    with metrics.span("search"):
+        ...
+    metrics.inc("llm_cache_hits")
+
+Set MPP_METRICS_LOG to a file path to also append one JSON line per span.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MetricsRegistry:
+    """Thread-safe store of stage latency histograms and counters."""
+
+    def __init__(self, prefix="mpp", log_path=None):
+        self.prefix = prefix
+        self.log_path = log_path if log_path is not None else os.environ.get("MPP_METRICS_LOG")
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        # Set by profiling.enable_profiling to profile every span
+        self.profiler = None
+
+    def observe(self, stage, seconds, **attrs):
+        """Record one duration for a stage."""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+            stats["count"] += 1
+            stats["sum"] += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+
+            if self.log_path:
+                record = {"ts": time.time(), "span": stage, "ms": round(seconds * 1000, 3), **attrs}
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """Time the enclosed block as one observation of stage."""
+        profiler = self.profiler
+        with profiler.stage(stage) if profiler else nullcontext():
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.observe(stage, time.perf_counter() - start, **attrs)
+
+    def inc(self, counter, value=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def to_dict(self):
+        """Snapshot of all stages and counters."""
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {
+                        "count": stats["count"],
+                        "sum_s": stats["sum"],
+                        "mean_ms": stats["sum"] / stats["count"] * 1000 if stats["count"] else 0.0,
+                    }
+                    for stage, stats in self._stages.items()
+                },
+                "counters": dict(self._counters),
+            }
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        name = f"{self.prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent per pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, stats in sorted(self._stages.items()):
+                for bound, count in zip(BUCKETS, stats["buckets"]):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {stats["count"]}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {stats["sum"]}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+            for counter, value in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{counter}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+
+# Process-wide registry used by all instrumented modules
+metrics = MetricsRegistry()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics (Prometheus text) and /metrics.json."""
+
+    registry = metrics
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = self.registry.render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body = json.dumps(self.registry.to_dict()).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=9464, host="127.0.0.1", registry=metrics):
+    """Serve metrics on a background thread and return the server."""
+    handler = type("BoundMetricsHandler", (MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Metrics available at http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,94 @@
+"""Minimal OpenAI-compatible chat completions server for local testing.
+
+Returns a canned answer for every request and counts how many requests it
+received, so the LLM response cache can be checked without a real API key.
+
+Usage:
+    python mock_openai_server.py --port 8700 --delay 0.5
+    set OPENAI_BASE_URL=http://127.0.0.1:8700/v1 and OPENAI_API_KEY=test
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Handles POST /v1/chat/completions and GET /stats."""
+
+    delay = 0.0
+    request_count = 0
+    count_lock = threading.Lock()
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json({"requests": type(self).request_count})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with self.count_lock:
+            type(self).request_count += 1
+            number = type(self).request_count
+        time.sleep(self.delay)
+
+        question = request.get("messages", [{}])[-1].get("content", "")
+        self._send_json({
+            "id": f"chatcmpl-mock-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"Mock answer #{number} ({len(question)} prompt chars)"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(question) // 4, "completion_tokens": 8,
+                      "total_tokens": len(question) // 4 + 8},
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(host="127.0.0.1", port=8700, delay=0.0):
+    """Start the mock server in a background thread and return it."""
+    handler = type("BoundMockOpenAIHandler", (MockOpenAIHandler,), {"delay": delay, "request_count": 0})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait per request")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.host, args.port, args.delay)
+    print(f"Mock OpenAI server on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Propose SOP and appendix pages for reference-mapping rows from the FAISS index.
+
+Each row of the reference CSV (see generate_reference_embeds.py) becomes one
+query from its Lesson Section Title and Reference Description. All rows are
+embedded in one batch and searched with one FAISS call, so hundreds of rows
+cost about as much as a handful of single queries. Hits are split by
+document (the SOP or an appendix); for each, the best page, widened to
+nearby pages that score almost as well, is proposed with a confidence (the
+cosine similarity of its best chunk, computed from the chunk vectors so it
+holds for projected indexes too).
+
+Check the entered pages, or fill empty ones into a new CSV:
+    python page_mapper.py --csv ../reference_mapping_template.csv --report mapping_report.csv
+    python page_mapper.py --csv ../reference_mapping_template.csv --fill --output mapped.csv
+"""
+import argparse
+import csv
+import re
+import sys
+import io
+from pathlib import Path
+import numpy as np
+from metrics import metrics
+
+# Chunks searched per row; enough for both the SOP and an appendix to show up
+SEARCH_K = 20
+# Hits this close in similarity to the best one, within PAGE_WINDOW pages, widen the range
+RANGE_MARGIN = 0.05
+PAGE_WINDOW = 2
+# Proposals below this confidence are reported but never filled in
+MIN_CONFIDENCE = 0.5
+
+APPENDIX_SOURCE = re.compile(r"^appendix\b", re.IGNORECASE)
+# Numbered SOP headings such as "2.1. DoD Mentor-Protégé Program"
+SECTION_HEADING = re.compile(r"\b(\d+(?:\.\d+)+)\.?\s+[A-Z]")
+
+# CSV columns (section, pages) per document kind
+COLUMNS = {
+    "sop": ("SOP Section", "SOP Page Numbers"),
+    "appendix": ("Appendix Section", "Appendix Page Numbers"),
+}
+
+
+def cosine(query, vectors):
+    """
+    Cosine similarity of a query with each chunk vector, clipped to [0, 1].
+
+    Computed from the vectors rather than FAISS scores, which are not
+    cosine distances once the index stores projected (PCA/OPQ) vectors.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    return np.clip(vectors @ query / np.where(norms > 0, norms, 1), 0.0, 1.0)
+
+
+def page_number(metadata):
+    """1-based page number of a chunk, preferring the PDF's own page label."""
+    label = str(metadata.get("page_label", ""))
+    if label.isdigit():
+        return int(label)
+    return int(metadata.get("page", 0)) + 1
+
+
+def parse_pages(text):
+    """Page numbers in a cell like '8-10' or '8-10, 14'; unparseable parts are ignored."""
+    pages = set()
+    for part in str(text or "").split(","):
+        bounds = [b.strip() for b in part.split("-")]
+        if not all(b.isdigit() for b in bounds) or len(bounds) > 2:
+            continue
+        first, last = int(bounds[0]), int(bounds[-1])
+        pages.update(range(first, last + 1))
+    return pages
+
+
+def format_pages(pages):
+    first, last = min(pages), max(pages)
+    return str(first) if first == last else f"{first}-{last}"
+
+
+def document_kind(metadata):
+    return "appendix" if APPENDIX_SOURCE.match(Path(metadata.get("source_file", "")).stem) else "sop"
+
+
+def row_query(row):
+    """Search text for a reference row."""
+    return f"{row.get('Lesson Section Title', '')}: {row.get('Reference Description', '')}".strip(": ")
+
+
+class PageMapper:
+    """Maps reference rows to SOP and appendix pages with one batched retrieval."""
+
+    def __init__(self, rag, k=SEARCH_K, range_margin=RANGE_MARGIN, page_window=PAGE_WINDOW):
+        """
+        Initialize the mapper.
+
+        Args:
+            rag: RAGSystem with a loaded vector store
+            k: Chunks searched per row
+            range_margin: Similarity gap within which nearby pages join the range
+            page_window: How far (in pages) from the best page the range may reach
+        """
+        self.rag = rag
+        self.k = k
+        self.range_margin = range_margin
+        self.page_window = page_window
+
+    def map_rows(self, rows):
+        """
+        Propose pages for every row.
+
+        Returns:
+            One dict per row mapping "sop" and "appendix" to a proposal
+            (source, section, pages, confidence) or None if nothing was found
+        """
+        if not rows:
+            return []
+        queries = [row_query(row) for row in rows]
+        with metrics.span("query_embed", batch=len(queries)):
+            vectors = self.rag.embeddings.embed_documents(queries)
+        with metrics.span("search", batch=len(queries)):
+            results = self.rag.search_batch_with_vectors(vectors, k=self.k)
+        proposals = []
+        for vector, hits in zip(vectors, results):
+            similarities = cosine(vector, [chunk_vector for _, _, chunk_vector in hits]) if hits else []
+            proposals.append(self.propose([(doc, float(sim)) for (doc, _, _), sim in zip(hits, similarities)]))
+        return proposals
+
+    def propose(self, hits):
+        """Best page range per document kind from one row's (Document, cosine similarity) hits."""
+        by_kind = {kind: [] for kind in COLUMNS}
+        for doc, sim in hits:
+            by_kind[document_kind(doc.metadata)].append((doc, sim))
+
+        proposals = {}
+        for kind, kind_hits in by_kind.items():
+            if not kind_hits:
+                proposals[kind] = None
+                continue
+            best_doc, best = max(kind_hits, key=lambda hit: hit[1])
+            source = best_doc.metadata.get("source_file", "")
+            center = page_number(best_doc.metadata)
+            pages = {
+                page_number(doc.metadata) for doc, sim in kind_hits
+                if doc.metadata.get("source_file", "") == source
+                and sim >= best - self.range_margin
+                and abs(page_number(doc.metadata) - center) <= self.page_window
+            }
+            proposals[kind] = {
+                "source": source,
+                "section": self._section(kind, source, best_doc.page_content),
+                "pages": format_pages(pages),
+                "confidence": round(best, 3),
+            }
+        return proposals
+
+    @staticmethod
+    def _section(kind, source, text):
+        if kind == "appendix":
+            return Path(source).stem
+        match = SECTION_HEADING.search(text)
+        return f"Section {match.group(1)}" if match else ""
+
+
+def check_row(row, proposals, fill=False, min_confidence=MIN_CONFIDENCE):
+    """
+    Compare a row's entered pages with the proposals, optionally filling empty cells.
+
+    Returns:
+        List of report dicts, one per document kind; status is one of
+        ok, mismatch, filled, missing, low confidence or not found
+    """
+    report = []
+    for kind, (section_col, pages_col) in COLUMNS.items():
+        proposal = proposals.get(kind)
+        entered = parse_pages(row.get(pages_col))
+        if proposal is None:
+            status = "not found"
+        elif entered:
+            status = "ok" if entered & parse_pages(proposal["pages"]) else "mismatch"
+        elif proposal["confidence"] < min_confidence:
+            status = "low confidence"
+        elif fill:
+            row[pages_col] = proposal["pages"]
+            if not row.get(section_col):
+                row[section_col] = proposal["section"]
+            status = "filled"
+        else:
+            status = "missing"
+        report.append({
+            "Module Number": row.get("Module Number", ""),
+            "Lesson Section Title": row.get("Lesson Section Title", ""),
+            "Document": kind,
+            "Entered Section": row.get(section_col, ""),
+            "Entered Pages": row.get(pages_col, ""),
+            "Proposed Section": proposal["section"] if proposal else "",
+            "Proposed Pages": proposal["pages"] if proposal else "",
+            "Confidence": proposal["confidence"] if proposal else "",
+            "Status": status,
+        })
+    return report
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Propose SOP/appendix pages for the reference mapping CSV")
+    parser.add_argument("--csv", default="../reference_mapping_template.csv", help="Reference mapping CSV")
+    parser.add_argument("--index", default="../data/faiss_index", help="Index location")
+    parser.add_argument("--fill", action="store_true", help="Fill empty page cells from confident proposals")
+    parser.add_argument("--output", help="Where to write the filled CSV (required with --fill)")
+    parser.add_argument("--report", help="Write the per-row proposals and statuses to this CSV")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE,
+                        help="Only fill proposals at least this confident")
+    parser.add_argument("-k", type=int, default=SEARCH_K, help="Chunks searched per row")
+    args = parser.parse_args()
+    if args.fill and not args.output:
+        parser.error("--fill needs --output")
+
+    with open(args.csv, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    from rag_system import RAGSystem
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+
+    metrics.reset()
+    mapper = PageMapper(rag, k=args.k)
+    proposals = mapper.map_rows(rows)
+    report = []
+    for row, row_proposals in zip(rows, proposals):
+        report.extend(check_row(row, row_proposals, fill=args.fill, min_confidence=args.min_confidence))
+
+    print(f"\n{'Module':<7} {'Lesson section':<30} {'Doc':<9} {'Entered':>8} {'Proposed':>9} {'Conf':>5}  Status")
+    for r in report:
+        print(f"{r['Module Number']:<7} {r['Lesson Section Title'][:30]:<30} {r['Document']:<9} "
+              f"{r['Entered Pages']:>8} {r['Proposed Pages']:>9} {r['Confidence']:>5}  {r['Status']}")
+
+    counts = {}
+    for r in report:
+        counts[r["Status"]] = counts.get(r["Status"], 0) + 1
+    stages = metrics.to_dict()["stages"]
+    elapsed = sum(stages.get(name, {}).get("sum_s", 0) for name in ("query_embed", "search")) * 1000
+    print(f"\n{len(rows)} rows mapped in {elapsed:.0f} ms (one embedding batch, one FAISS search): "
+          + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(report[0]) if report else [])
+            writer.writeheader()
+            writer.writerows(report)
+        print(f"Report written to {args.report}")
+    if args.fill:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            # Keep the mapping file's line endings so the fill diffs cleanly
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Filled CSV written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
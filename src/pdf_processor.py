@@ -1,50 +1,133 @@
 """PDF processing and text extraction module."""
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from metrics import metrics
+from pdf_extractors import DEFAULT_EXTRACTOR, PageCache, file_hash, get_extractor
+from span_splitter import SpanSplitter
+
+def _load_pdf(path, extractor=DEFAULT_EXTRACTOR):
+    """Load one PDF (module-level so it can run in a worker process)."""
+    start = time.perf_counter()
+    pdf_docs = get_extractor(extractor).extract(path)
+    return pdf_docs, time.perf_counter() - start
 
 class PDFProcessor:
-    def __init__(self, chunk_size=1000, chunk_overlap=200):
+    def __init__(self, chunk_size=1000, chunk_overlap=200, extractor=DEFAULT_EXTRACTOR, page_cache=None,
+                 splitter="recursive"):
+        """
+        Initialize the processor.
+
+        Args:
+            chunk_size: Characters per chunk
+            chunk_overlap: Characters shared by neighbouring chunks
+            extractor: PDF backend name (see pdf_extractors.EXTRACTORS)
+            page_cache: Optional PageCache, or a path to one, to skip re-parsing unchanged PDFs
+            splitter: "recursive" (LangChain) or "span" (single-pass SpanSplitter,
+                faster on dense tables but chunk boundaries can differ)
+        """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        self.extractor = get_extractor(extractor).name
+        if isinstance(page_cache, (str, os.PathLike)):
+            page_cache = PageCache(str(page_cache))
+        self.page_cache = page_cache
+        if splitter == "span":
+            self.text_splitter = SpanSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        elif splitter == "recursive":
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                separators=["\n\n", "\n", " ", ""]
+            )
+        else:
+            raise ValueError(f"Unknown splitter '{splitter}'. Choose 'span' or 'recursive'")
 
-    def extract_pdfs(self, folder_paths):
+    def extract_pdfs(self, folder_paths, workers=1):
         """Extract text from all PDFs in given folders."""
-        documents = []
+        pdf_files = []
 
         for folder_path in folder_paths:
             if not os.path.exists(folder_path):
                 print(f"Warning: Folder not found: {folder_path}")
                 continue
 
-            pdf_files = list(Path(folder_path).glob("*.pdf"))
-            print(f"Found {len(pdf_files)} PDFs in {folder_path}")
+            folder_pdfs = list(Path(folder_path).glob("*.pdf"))
+            print(f"Found {len(folder_pdfs)} PDFs in {folder_path}")
+            pdf_files.extend(folder_pdfs)
+
+        return self.extract_files(pdf_files, workers=workers)
+
+    def extract_files(self, pdf_files, workers=1):
+        """
+        Extract text from the given PDF files.
+
+        Args:
+            pdf_files: Paths of PDF files
+            workers: Parse this many PDFs in parallel worker processes
 
+        Returns:
+            List of page Documents with source_file metadata
+        """
+        documents = []
+        pdf_files = [Path(f) for f in pdf_files]
+
+        # Serve unchanged files from the page cache; only the rest are parsed
+        cached, digests = {}, {}
+        if self.page_cache:
             for pdf_file in pdf_files:
                 try:
+                    digests[pdf_file] = file_hash(pdf_file)
+                except OSError:
+                    continue
+                pages = self.page_cache.get(digests[pdf_file], self.extractor, pdf_file)
+                if pages is not None:
+                    cached[pdf_file] = pages
+
+        pool = None
+        to_parse = [f for f in pdf_files if f not in cached]
+        if workers > 1 and len(to_parse) > 1:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            pending = {f: pool.submit(_load_pdf, str(f), self.extractor) for f in to_parse}
+
+        for pdf_file in pdf_files:
+            try:
+                if pdf_file in cached:
+                    print(f"  Cached: {pdf_file.name}")
+                    pdf_docs = cached[pdf_file]
+                    metrics.inc("pages_cached", len(pdf_docs))
+                else:
                     print(f"  Processing: {pdf_file.name}")
-                    loader = PyPDFLoader(str(pdf_file))
-                    pdf_docs = loader.load()
+                    if pool:
+                        pdf_docs, seconds = pending[pdf_file].result()
+                        metrics.observe("extract", seconds, file=pdf_file.name)
+                    else:
+                        with metrics.span("extract", file=pdf_file.name):
+                            pdf_docs, _ = _load_pdf(str(pdf_file), self.extractor)
+                    metrics.inc("pages_extracted", len(pdf_docs))
+                    if pdf_file in digests:
+                        self.page_cache.put(digests[pdf_file], self.extractor, pdf_docs)
+
+                # Add source metadata
+                for doc in pdf_docs:
+                    doc.metadata["source_file"] = pdf_file.name
 
-                    # Add source metadata
-                    for doc in pdf_docs:
-                        doc.metadata["source_file"] = pdf_file.name
+                documents.extend(pdf_docs)
+            except Exception as e:
+                print(f"    Error processing {pdf_file.name}: {e}")
 
-                    documents.extend(pdf_docs)
-                except Exception as e:
-                    print(f"    Error processing {pdf_file.name}: {e}")
+        if pool:
+            pool.shutdown()
 
         print(f"\nTotal pages extracted: {len(documents)}")
         return documents
 
     def chunk_documents(self, documents):
         """Split documents into chunks."""
-        chunks = self.text_splitter.split_documents(documents)
+        with metrics.span("split", pages=len(documents)):
+            chunks = self.text_splitter.split_documents(documents)
+        metrics.inc("chunks_processed", len(chunks))
         print(f"Created {len(chunks)} chunks")
         return chunks
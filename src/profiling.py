@@ -0,0 +1,112 @@
+"""Built-in profiling for index builds and queries.
+
+When enabled, every instrumented stage (the spans in metrics.py: extract,
+split, dedup, embed, index_add, query_embed, search, rerank, generate) is
+run under cProfile and a stack sampler. write_reports() then produces, per
+stage:
+
+    <stage>.prof     cProfile stats (snakeviz, gprof2dot, pstats)
+    <stage>.folded   collapsed stacks for flamegraph.pl / speedscope
+and a hot_functions.txt summary with the top-N functions of each stage.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from metrics import metrics
+
+
+class StageProfiler:
+    """Profiles named stages with cProfile plus a sampling profiler."""
+
+    def __init__(self, output_dir, sample_interval=0.005, top_n=25):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory to write reports to
+            sample_interval: Seconds between stack samples
+            top_n: Functions listed per stage in the summary
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+        self._profiles = {}
+        self._samples = {}
+        # Only one stage is profiled at a time; concurrent or nested stages
+        # run unprofiled rather than corrupting the active profile
+        self._busy = threading.Lock()
+
+    def _sample(self, target_ident, samples, stop):
+        while not stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(target_ident)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                samples[";".join(reversed(stack))] += 1
+
+    @contextmanager
+    def stage(self, name):
+        """Profile the enclosed block as part of stage name."""
+        if not self._busy.acquire(blocking=False):
+            yield
+            return
+
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        samples = self._samples.setdefault(name, Counter())
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample, args=(threading.get_ident(), samples, stop), daemon=True
+        )
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            stop.set()
+            sampler.join()
+            self._busy.release()
+
+    def hot_functions(self, name, sort="cumulative"):
+        """Top-N functions of a stage as printed by pstats."""
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiles[name], stream=out)
+        stats.strip_dirs().sort_stats(sort).print_stats(self.top_n)
+        return out.getvalue()
+
+    def write_reports(self):
+        """Write .prof, .folded and the hot-function summary for all stages."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary = []
+        for name in sorted(self._profiles):
+            self._profiles[name].dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+            with open(os.path.join(self.output_dir, f"{name}.folded"), "w", encoding="utf-8") as f:
+                for stack, count in self._samples[name].most_common():
+                    f.write(f"{stack} {count}\n")
+            summary.append(f"{'=' * 60}\nSTAGE: {name}\n{'=' * 60}")
+            summary.append(self.hot_functions(name, "tottime"))
+
+        path = os.path.join(self.output_dir, "hot_functions.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(summary))
+        print(f"Profile reports written to {self.output_dir}")
+        return path
+
+
+def enable_profiling(output_dir="./profiles", **kwargs):
+    """Profile every instrumented stage from now on. Returns the profiler."""
+    if metrics.profiler is None:
+        metrics.profiler = StageProfiler(output_dir, **kwargs)
+    return metrics.profiler
+
+
+def disable_profiling():
+    metrics.profiler = None
@@ -0,0 +1,168 @@
+"""Learned dimensionality reduction (PCA or OPQ) for the FAISS index.
+
+MiniLM vectors have 384 dimensions, and a narrow corpus uses few of them. A
+projection fitted on the corpus vectors at build time is stored inside the
+index as a FAISS IndexPreTransform. Stored vectors and query vectors pass
+through it automatically, and it is saved and loaded with the index, so
+nothing else changes. OPQ needs about 10,000 vectors to train its codebooks;
+on smaller corpora PCA is used instead. PCA needs at least as many vectors
+as output dimensions; a corpus smaller than that is stored unprojected.
+
+Compare search speed, index size and recall against the full dimension:
+    python projection.py --index ../data/faiss_index --dims 64 128
+"""
+import argparse
+import sys
+import io
+import time
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+PROJECTIONS = ("pca", "opq")
+DEFAULT_PROJECTION_DIM = 128
+# OPQ sub-quantizers (must divide the output dimension) and the vectors it needs to train
+OPQ_SUBQUANTIZERS = 8
+OPQ_MIN_TRAINING = 256 * 39
+
+
+def build_projected_index(vectors, kind="pca", dim=DEFAULT_PROJECTION_DIM):
+    """
+    An empty flat L2 index behind a projection trained on vectors.
+
+    Args:
+        vectors: Corpus embeddings to fit the projection on (n x d)
+        kind: "pca" or "opq"
+        dim: Output dimension
+
+    Returns:
+        Trained faiss.IndexPreTransform, or a plain IndexFlatL2 if there are
+        too few vectors to fit the projection; add the vectors to it separately
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    d = vectors.shape[1]
+    if kind not in PROJECTIONS:
+        raise ValueError(f"Unknown projection {kind!r}; choose from {', '.join(PROJECTIONS)}")
+    if not 0 < dim < d:
+        raise ValueError(f"Projection dimension must be between 1 and {d - 1}, got {dim}")
+    if kind == "opq" and len(vectors) < OPQ_MIN_TRAINING:
+        print(f"Warning: OPQ needs {OPQ_MIN_TRAINING} training vectors, have {len(vectors)}; trying PCA")
+        kind = "pca"
+    if len(vectors) < dim:
+        # PCA cannot output more dimensions than it has training vectors
+        print(f"Warning: projecting to {dim} dimensions needs at least {dim} vectors, "
+              f"have {len(vectors)}; storing unprojected {d}-dimension vectors")
+        return faiss.IndexFlatL2(d)
+    if kind == "opq":
+        transform = faiss.OPQMatrix(d, OPQ_SUBQUANTIZERS, dim)
+    else:
+        transform = faiss.PCAMatrix(d, dim)
+    index = faiss.IndexPreTransform(transform, faiss.IndexFlatL2(dim))
+    index.train(vectors)
+    if kind == "pca":
+        # The training covariance basis is not needed to project (A and b are); don't save it
+        transform.PCAMat.clear()
+    return index
+
+
+def stored_dimension(index):
+    """Dimension vectors are stored and searched in."""
+    if isinstance(index, faiss.IndexPreTransform):
+        return index.index.d
+    return index.d
+
+
+def index_bytes(index):
+    return faiss.serialize_index(index).nbytes
+
+
+def project_store(store, kind="pca", dim=DEFAULT_PROJECTION_DIM):
+    """A copy of a flat FAISS store with a projection, sharing its docstore."""
+    vectors = store.index.reconstruct_n(0, store.index.ntotal)
+    index = build_projected_index(vectors, kind, dim)
+    index.add(vectors)
+    return FAISS(
+        store.embedding_function,
+        index,
+        store.docstore,
+        dict(store.index_to_docstore_id),
+    )
+
+
+def compare_projections(rag, golden, dims=(64, 128), kinds=("pca",), k=8, repeats=20):
+    """
+    Search latency, index size and golden-set recall for each projection.
+
+    Also reports how many of the full-dimension top-k neighbours each
+    projection keeps. The full-dimension store is restored afterwards.
+    """
+    from benchmark import evaluate_golden
+
+    full = rag.vector_store
+    questions = np.asarray(rag.embeddings.embed_documents([q["question"] for q in golden]), dtype=np.float32)
+    configs = [("full", full.index.d, full)] + [
+        (kind, dim, project_store(full, kind, dim)) for kind in kinds for dim in dims
+    ]
+    _, baseline = full.index.search(questions, k)
+
+    rows = []
+    try:
+        for kind, dim, store in configs:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                _, neighbours = store.index.search(questions, k)
+            search_us = (time.perf_counter() - start) / (repeats * len(questions)) * 1e6
+            overlap = np.mean([
+                len(set(a) & set(b)) / k for a, b in zip(neighbours, baseline)
+            ])
+            rag._swap_vector_store(store)
+            quality = evaluate_golden(rag, golden)
+            rows.append({
+                "projection": kind,
+                "dim": dim,
+                "vector_bytes": store.index.ntotal * stored_dimension(store.index) * 4,
+                "index_bytes": index_bytes(store.index),
+                "search_us": search_us,
+                "overlap": overlap,
+                "recall@4": quality["recall@4"],
+                "recall@8": quality["recall@8"],
+                "mrr": quality["mrr"],
+            })
+    finally:
+        rag._swap_vector_store(full)
+    return rows
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Compare PCA/OPQ projections with full-dimension search")
+    parser.add_argument("--index", default="../data/faiss_index", help="Full-dimension index location")
+    parser.add_argument("--dims", type=int, nargs="+", default=[64, 128], help="Projection dimensions")
+    parser.add_argument("--kind", choices=PROJECTIONS, nargs="+", default=["pca"], help="Projections to try")
+    parser.add_argument("--golden", help="Golden questions JSON")
+    args = parser.parse_args()
+
+    from rag_system import RAGSystem
+    from benchmark import DEFAULT_GOLDEN, load_golden
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    if isinstance(rag.vector_store.index, faiss.IndexPreTransform):
+        raise SystemExit(f"{args.index} is already projected; compare against a full-dimension index")
+    rows = compare_projections(rag, load_golden(args.golden or DEFAULT_GOLDEN), args.dims, args.kind)
+
+    print(f"\n{rag.vector_store.index.ntotal} vectors")
+    print(f"{'Projection':<11} {'Dim':>4} {'Vectors':>10} {'Index file':>11} {'Search':>10} {'Top-8 kept':>11} "
+          f"{'Recall@4':>9} {'Recall@8':>9} {'MRR':>6}")
+    for r in rows:
+        print(f"{r['projection']:<11} {r['dim']:>4} {r['vector_bytes'] / 1024:>7.0f} KB "
+              f"{r['index_bytes'] / 1024:>8.0f} KB "
+              f"{r['search_us']:>7.1f} us {r['overlap']:>11.0%} "
+              f"{r['recall@4']:>9.3f} {r['recall@8']:>9.3f} {r['mrr']:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
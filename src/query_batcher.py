@@ -0,0 +1,162 @@
+"""Micro-batching scheduler for query embedding and FAISS search.
+
+Under load, embedding one question per call wastes most of the model's
+throughput on CPU. QueryBatcher collects questions arriving within a short
+window (or until max_batch_size), encodes them in one embed_documents call
+and runs all their FAISS searches as one batched index.search. Chat turns,
+which blend their own query vector, join the batch already embedded.
+
+Load test (throughput and tail latency with and without batching):
+    python query_batcher.py --index ../data/faiss_index --clients 32
+"""
+import argparse
+import queue
+import sys
+import io
+import threading
+import time
+from concurrent.futures import Future
+from metrics import metrics
+
+
+class QueryBatcher:
+    """Collects concurrent searches into micro-batches handled by one dispatcher thread."""
+
+    def __init__(self, rag, window_ms=5.0, max_batch_size=32):
+        """
+        Initialize the batcher and start its dispatcher thread.
+
+        Args:
+            rag: RAGSystem whose embeddings and index are searched
+            window_ms: How long to wait for more questions after the first arrives
+            max_batch_size: Dispatch as soon as this many questions are waiting
+        """
+        self.rag = rag
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+        self._thread.start()
+
+    def search(self, question, k=4):
+        """Top-k (Document, score) tuples for a question; blocks until its batch is done."""
+        return self._submit(question, None, k, False)
+
+    def search_with_vectors(self, vector, k=4):
+        """Top-k (Document, score, chunk vector) tuples for an already embedded query."""
+        return self._submit(None, vector, k, True)
+
+    def _submit(self, question, vector, k, with_vectors):
+        future = Future()
+        self._queue.put((question, vector, k, with_vectors, future))
+        return future.result()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            self._dispatch(self._collect(first))
+
+    def _dispatch(self, batch):
+        questions = [question for question, vector, _, _, _ in batch if vector is None]
+        try:
+            if questions:
+                metrics.inc("micro_batches")
+                metrics.inc("micro_batched_queries", len(questions))
+                with metrics.span("query_embed", batch=len(questions)):
+                    embedded = iter(self.rag.embeddings.embed_documents(questions))
+            vectors = [next(embedded) if vector is None else vector for _, vector, _, _, _ in batch]
+            k = max(item[2] for item in batch)
+            results = [None] * len(batch)
+            with metrics.span("search", batch=len(batch)):
+                # Searches that also need chunk vectors (conversation turns) go in their own call
+                for with_vectors in (False, True):
+                    positions = [i for i, item in enumerate(batch) if item[3] == with_vectors]
+                    if not positions:
+                        continue
+                    search = self.rag.search_batch_with_vectors if with_vectors else self.rag.search_batch
+                    for i, hits in zip(positions, search([vectors[i] for i in positions], k=k)):
+                        results[i] = hits
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, k, _, future), hits in zip(batch, results):
+            future.set_result(hits[:k])
+
+    def close(self):
+        """Stop the dispatcher after the queued questions are answered."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Load test query micro-batching")
+    parser.add_argument("--index", default="../data/faiss_index", help="Index location")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per client")
+    parser.add_argument("--window-ms", type=float, action="append",
+                        help="Batching windows to test (repeatable; default 5 and 10)")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    from rag_system import RAGSystem
+    from benchmark import benchmark_throughput
+    from local_answerer import DEFAULT_QUESTIONS
+
+    rag = RAGSystem(use_openai=False)
+    rag.load_vector_store(args.index)
+    rag.retrieve(DEFAULT_QUESTIONS[0])
+
+    batching_embedder = rag.query_embedder
+    rows = []
+    for window_ms in ["off", None] + (args.window_ms or [5.0, 10.0]):
+        # "off": one embed_query call per question, the pre-batching behaviour
+        rag.query_embedder = rag.embeddings if window_ms == "off" else batching_embedder
+        rag.set_micro_batching(None if window_ms == "off" else window_ms, args.max_batch_size)
+        metrics.reset()
+        result = benchmark_throughput(rag, DEFAULT_QUESTIONS, args.clients, args.queries)
+        counters = metrics.to_dict()["counters"]
+        batch = counters.get("micro_batched_queries", 0) / max(1, counters.get("micro_batches", 0))
+        if window_ms == "off":
+            label = "unbatched"
+        elif window_ms is None:
+            label = "no window"
+        else:
+            label = f"{window_ms:g} ms window"
+        rows.append((label, result, batch))
+    rag.set_micro_batching(None)
+    rag.query_embedder = batching_embedder
+
+    print(f"\n{args.clients} clients x {args.queries} queries")
+    print(f"{'Mode':<14} {'QPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Batch':>6}")
+    for label, r, batch in rows:
+        print(f"{label:<14} {r['qps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {batch:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
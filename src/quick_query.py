@@ -1,17 +1,27 @@
 """Quick query script for RAG system."""
+import argparse
 import os
 import sys
 import io
 from pathlib import Path
 from pdf_processor import PDFProcessor
 from rag_system import RAGSystem
+from dedup import ChunkDeduplicator
+from profiling import enable_profiling
 
 # Fix encoding issues on Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 def main():
-    question = sys.argv[1] if len(sys.argv) > 1 else "What are some specific oversight duties for Program Managers?"
+    parser = argparse.ArgumentParser(description="Ask the RAG system one question")
+    parser.add_argument("question", nargs="?",
+                        default="What are some specific oversight duties for Program Managers?")
+    parser.add_argument("--profile", nargs="?", const="./profiles", metavar="DIR",
+                        help="Profile each stage and write reports to DIR (default ./profiles)")
+    args = parser.parse_args()
+    question = args.question
+    profiler = enable_profiling(args.profile) if args.profile else None
 
     # Define paths
     core_docs_path = "../../Core Documents"
@@ -32,6 +42,7 @@ def main():
             processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
             documents = processor.extract_pdfs([core_docs_path, modules_path])
             chunks = processor.chunk_documents(documents)
+            chunks = ChunkDeduplicator().dedupe(chunks)
             rag.build_vector_store(chunks)
             rag.save_vector_store(vector_store_path)
     else:
@@ -39,6 +50,7 @@ def main():
         processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
         documents = processor.extract_pdfs([core_docs_path, modules_path])
         chunks = processor.chunk_documents(documents)
+        chunks = ChunkDeduplicator().dedupe(chunks)
         rag.build_vector_store(chunks)
         os.makedirs(vector_store_path, exist_ok=True)
         rag.save_vector_store(vector_store_path)
@@ -46,5 +58,8 @@ def main():
     # Query
     rag.query(question, verbose=True)
 
+    if profiler:
+        profiler.write_reports()
+
 if __name__ == "__main__":
     main()
@@ -1,17 +1,43 @@
 """RAG (Retrieval-Augmented Generation) system using FAISS and sentence transformers."""
 import os
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
 from pdf_processor import PDFProcessor
+from context_compressor import ContextCompressor
+from local_answerer import ExtractiveAnswerer
+from adaptive_retrieval import AdaptiveRetriever
+from chunk_store import CompactDocstore
+from concurrency import RWLock, BatchingEmbedder
+from query_batcher import QueryBatcher
+from warmup import warm_up
+from conversation import is_follow_up
+from projection import DEFAULT_PROJECTION_DIM, build_projected_index
+from lexicon import Lexicon
+from metrics import metrics
 
 class RAGSystem:
-    def __init__(self, use_openai=False, api_key=None):
+    def __init__(self, use_openai=False, api_key=None, context_token_budget=300,
+                 k=4, adaptive_k=True, max_k=8, retrieval_token_budget=1500, micro_batch_ms=None,
+                 projection=None, projection_dim=DEFAULT_PROJECTION_DIM, expand_queries=True):
         """
         Initialize RAG system.
 
         Args:
             use_openai: If True, uses OpenAI API (requires OPENAI_API_KEY)
             api_key: OpenAI API key (optional, can use env var)
+            context_token_budget: Max estimated tokens of compressed context
+            k: Number of chunks to retrieve when adaptive_k is off
+            adaptive_k: Choose k per question from score gaps and a token budget
+            max_k: Upper bound on chunks for adaptive retrieval
+            retrieval_token_budget: Max estimated tokens of retrieved chunks
+            micro_batch_ms: Batch queries arriving within this window (for servers under load)
+            projection: "pca" or "opq" to store vectors at projection_dim dimensions
+                (fitted when the store is built, saved with the index)
+            projection_dim: Output dimension of the projection
+            expand_queries: Add the other form of acronyms and long forms to questions
+                (from the lexicon built with the index, see lexicon.py)
         """
         print("Initializing RAG System...")
 
@@ -22,25 +48,351 @@ class RAGSystem:
             model_kwargs={"device": "cpu"}
         )
 
+        # Keeps only the sentences relevant to the question
+        self.compressor = ContextCompressor(self.embeddings, token_budget=context_token_budget)
+        # Offline answers: ranked sentences with source citations
+        self.answerer = ExtractiveAnswerer(self.compressor)
+
+        self.k = k
+        self.adaptive_k = adaptive_k
+        self.adaptive_retriever = AdaptiveRetriever(max_k=max_k, token_budget=retrieval_token_budget)
+
         self.vector_store = None
         self.retriever = None
         self.qa_chain = None
         self.use_openai = use_openai
+        self.projection = projection
+        self.projection_dim = projection_dim
+        self.expand_queries = expand_queries
+        self.lexicon = None
+
+        # Searches share the index; updates wait for them and run alone.
+        # Rebuilds and loads are prepared outside the lock and swapped in.
+        self._index_lock = RWLock()
+        # Concurrent questions are embedded together
+        self.query_embedder = BatchingEmbedder(self.embeddings)
+        self.query_batcher = None
+        self.set_micro_batching(micro_batch_ms)
+
+        # Bumped on every index change; cached FAQ results from older versions are dropped
+        self.index_version = 0
+        self.faq_cache = None
 
         if use_openai and api_key:
             os.environ["OPENAI_API_KEY"] = api_key
 
         print("RAG System initialized!")
 
-    def build_vector_store(self, documents):
-        """Build FAISS vector store from documents."""
+    def build_vector_store(self, documents, ids=None):
+        """Build FAISS vector store from documents (optionally with docstore IDs)."""
         print(f"\nBuilding vector store from {len(documents)} documents...")
-        self.vector_store = FAISS.from_documents(documents, self.embeddings)
-        self.retriever = self.vector_store.as_retriever(
+        texts = [doc.page_content for doc in documents]
+        with metrics.span("embed", chunks=len(texts)):
+            vectors = self.embeddings.embed_documents(texts)
+        with metrics.span("index_add", chunks=len(texts)):
+            if self.projection:
+                # Queries pass through the same fitted projection inside the index
+                vector_store = FAISS(
+                    self.embeddings,
+                    build_projected_index(vectors, self.projection, self.projection_dim),
+                    CompactDocstore(),
+                    {}
+                )
+                vector_store.add_embeddings(
+                    list(zip(texts, vectors)),
+                    metadatas=[doc.metadata for doc in documents],
+                    ids=ids
+                )
+            else:
+                vector_store = FAISS.from_embeddings(
+                    list(zip(texts, vectors)),
+                    self.embeddings,
+                    metadatas=[doc.metadata for doc in documents],
+                    ids=ids,
+                    # Pages stored once; chunk text is sliced out only for hits
+                    docstore=CompactDocstore()
+                )
+        with metrics.span("lexicon", chunks=len(texts)):
+            lexicon = Lexicon()
+            lexicon.add_documents(documents)
+        self._swap_vector_store(vector_store, lexicon)
+        print("Vector store created successfully!")
+
+    def _swap_vector_store(self, vector_store, lexicon=None):
+        """Publish a new store (and its lexicon, if given); in-flight searches finish on the old one."""
+        retriever = vector_store.as_retriever(
             search_type="similarity",
-            search_kwargs={"k": 4}  # Return top 4 relevant chunks
+            search_kwargs={"k": self.k}
         )
-        print("Vector store created successfully!")
+        with self._index_lock.write():
+            self.vector_store = vector_store
+            self.retriever = retriever
+            if lexicon is not None:
+                self.lexicon = lexicon
+            self.index_version += 1
+
+    def add_documents(self, documents, ids=None):
+        """Embed documents and add them to the existing vector store."""
+        if not self.vector_store:
+            self.build_vector_store(documents, ids=ids)
+            return
+        print(f"\nAdding {len(documents)} documents to vector store...")
+        texts = [doc.page_content for doc in documents]
+        with metrics.span("embed", chunks=len(texts)):
+            vectors = self.embeddings.embed_documents(texts)
+        with metrics.span("index_add", chunks=len(texts)), self._index_lock.write():
+            self.vector_store.add_embeddings(
+                list(zip(texts, vectors)),
+                metadatas=[doc.metadata for doc in documents],
+                ids=ids
+            )
+            self.lexicon.add_documents(documents)
+            self.index_version += 1
+
+    def delete_documents(self, ids):
+        """Remove documents from the vector store by docstore ID."""
+        if self.vector_store and ids:
+            with self._index_lock.write():
+                store = self.vector_store
+                deleted = [store.docstore.search(i) for i in ids]
+                store.delete(ids)
+                self.lexicon.remove_documents(doc for doc in deleted if not isinstance(doc, str))
+                self.index_version += 1
+
+    def build_overlay_store(self, documents, store=None):
+        """
+        Embed documents into a private store, searched next to the shared index.
+
+        The overlay is an empty clone of the shared index, so it reuses any
+        trained projection and its scores are comparable with search_by_vector.
+        The shared index and lexicon are left untouched. Pass an existing
+        overlay as store to add to it.
+        """
+        texts = [doc.page_content for doc in documents]
+        with metrics.span("embed", chunks=len(texts)):
+            vectors = self.embeddings.embed_documents(texts)
+        if store is None:
+            with self._index_lock.read():
+                shared = self.vector_store
+                if shared is None:
+                    index, normalize_L2 = faiss.IndexFlatL2(len(vectors[0])), False
+                else:
+                    index, normalize_L2 = faiss.clone_index(shared.index), shared._normalize_L2
+                    index.reset()
+            store = FAISS(self.embeddings, index, CompactDocstore(), {}, normalize_L2=normalize_L2)
+        store.add_embeddings(
+            list(zip(texts, vectors)),
+            metadatas=[doc.metadata for doc in documents]
+        )
+        return store
+
+    def merge_overlay(self, question, docs, overlay):
+        """
+        Let overlay hits replace the weakest of docs, the shared results for question.
+
+        Both stores are searched with one (expanded) query embedding and
+        overlay chunks that rank within the top len(docs) go first.
+        """
+        k = max(1, len(docs))
+        vector = self.query_embedder.embed_query(self.search_text(question))
+        hits = [(score, True, doc) for doc, score in overlay.similarity_search_with_score_by_vector(vector, k=k)]
+        if self.vector_store:
+            hits += [(score, False, doc) for doc, score in self.search_by_vector(vector, k=k)]
+        hits.sort(key=lambda hit: hit[0])
+        uploaded = [doc for _, from_overlay, doc in hits[:k] if from_overlay]
+        return uploaded + docs[:k - len(uploaded)]
+
+    def similarity_search_with_score(self, question, k=4):
+        """
+        Retrieve the top-k chunks for a question together with their scores.
+
+        Args:
+            question: User's question
+            k: Number of chunks to return
+
+        Returns:
+            List of (Document, score) tuples, lowest (best) L2 distance first
+        """
+        if not self.vector_store:
+            return []
+        vector = self.query_embedder.embed_query(self.search_text(question))
+        return self.search_by_vector(vector, k=k)
+
+    def search_by_vector(self, vector, k=4):
+        """Top-k (Document, score) tuples for a query embedding."""
+        with self._index_lock.read():
+            return self.vector_store.similarity_search_with_score_by_vector(vector, k=k)
+
+    def search_batch(self, vectors, k=4):
+        """Top-k (Document, score) tuples for many query embeddings in one FAISS call."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._index_lock.read():
+            store = self.vector_store
+            if store._normalize_L2:
+                vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+            scores, indices = store.index.search(vectors, k)
+            return [
+                [
+                    (store.docstore.search(store.index_to_docstore_id[i]), float(score))
+                    for score, i in zip(row_scores, row_indices)
+                    if i != -1
+                ]
+                for row_scores, row_indices in zip(scores, indices)
+            ]
+
+    def search_with_vectors(self, vector, k=4):
+        """Top-k (Document, score, chunk vector) tuples for a query embedding."""
+        return self.search_batch_with_vectors([vector], k=k)[0]
+
+    def search_batch_with_vectors(self, vectors, k=4):
+        """search_with_vectors for many query embeddings in one FAISS call."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._index_lock.read():
+            store = self.vector_store
+            if store._normalize_L2:
+                vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+            scores, indices = store.index.search(vectors, k)
+            results = []
+            for vector, row_scores, row_indices in zip(vectors, scores, indices):
+                found = [(float(score), int(i)) for score, i in zip(row_scores, row_indices) if i != -1]
+                if not found:
+                    results.append([])
+                    continue
+                chunk_vectors = store.index.reconstruct_batch(np.array([i for _, i in found], dtype=np.int64))
+                if isinstance(store.index, faiss.IndexPreTransform):
+                    # Projected distances leave out the query's residual; score against the
+                    # reconstructions instead so these hits compare with re-scored ones
+                    found = [(float(np.sum((vector - v) ** 2)), i) for (_, i), v in zip(found, chunk_vectors)]
+                results.append([
+                    (store.docstore.search(store.index_to_docstore_id[i]), score, chunk_vector)
+                    for (score, i), chunk_vector in zip(found, chunk_vectors)
+                ])
+            return results
+
+    def search_text(self, question):
+        """The text embedded for a question: expanded with the lexicon when enabled."""
+        if not self.expand_queries or self.lexicon is None:
+            return question
+        return self.lexicon.expand(question)
+
+    def set_micro_batching(self, window_ms, max_batch_size=32):
+        """
+        Route retrieval through a QueryBatcher (or back to direct calls with None).
+
+        Worth enabling when many sessions query at once; a lone query waits
+        up to window_ms for company.
+        """
+        old, self.query_batcher = self.query_batcher, None
+        if old:
+            old.close()
+        if window_ms is not None:
+            self.query_batcher = QueryBatcher(self, window_ms=window_ms, max_batch_size=max_batch_size)
+
+    def warm_up(self, faq_questions=None):
+        """Run first-call code paths and precompute FAQ answers (see warmup.py)."""
+        return warm_up(self, faq_questions)
+
+    def retrieve(self, question):
+        """
+        Retrieve the chunks to answer a question from.
+
+        Uses adaptive k (score gap + token budget, overlap duplicates
+        collapsed) when enabled, otherwise the fixed top-k. Acronyms and
+        long forms are expanded before embedding (see search_text). FAQ
+        questions are served from the FAQ cache while the index is
+        unchanged; the returned list is shared and must not be modified.
+        """
+        if self.faq_cache is None or question not in self.faq_cache:
+            return self._retrieve(question)
+        # Read first, so results racing an index change are stored as stale
+        version = self.index_version
+        docs = self.faq_cache.get(question, version)
+        if docs is None:
+            docs = self._retrieve(question)
+            self.faq_cache.put(question, version, docs)
+        return docs
+
+    def retrieve_in_conversation(self, question, conversation):
+        """
+        Retrieve for a chat turn, using the conversation's previous turn for follow-ups.
+
+        A follow-up is searched with its own embedding plus a share of the
+        previous turn's cached query vector, and the previous turn's chunks
+        compete with the new hits. Other questions are retrieved as usual
+        (including the FAQ cache). Either way one question is embedded.
+        With micro-batching on, the search joins the QueryBatcher's batches.
+
+        Args:
+            question: User's question
+            conversation: The session's Conversation, updated with this turn
+        """
+        previous = conversation.last if is_follow_up(question) else None
+        if previous is None:
+            if self.faq_cache is not None and question in self.faq_cache:
+                docs = self.retrieve(question)
+                # Embedded later only if a follow-up needs it
+                conversation.record(question, None, [], self.index_version)
+                return docs
+            texts = [self.search_text(question)]
+        else:
+            metrics.inc("follow_up_queries")
+            # A turn answered from the FAQ cache was never embedded; do it in the same call
+            texts = [self.search_text(question)]
+            if previous["query_vector"] is None:
+                texts.append(self.search_text(previous["question"]))
+
+        with metrics.span("query_embed"):
+            if len(texts) == 1:
+                vectors = [self.query_embedder.embed_query(texts[0])]
+            else:
+                vectors = self.embeddings.embed_documents(texts)
+        vector = np.asarray(vectors[0], dtype=np.float32)
+        query = vector
+        if previous is not None:
+            if previous["query_vector"] is None:
+                previous["query_vector"] = np.asarray(vectors[1], dtype=np.float32)
+            query = conversation.query_vector(vector, previous)
+
+        k = self.adaptive_retriever.max_k if self.adaptive_k else self.k
+        version = self.index_version
+        if self.query_batcher:
+            # Searched with other sessions' queries; the batcher records the span
+            hits = self.query_batcher.search_with_vectors(query, k=k)
+        else:
+            with metrics.span("search"):
+                hits = self.search_with_vectors(query, k=k)
+        # Chunks of an older index may be gone; only reuse same-version ones
+        if previous is not None and previous["version"] == version:
+            hits = conversation.merge(query, hits, previous["hits"], k)
+        conversation.record(question, query, hits, version)
+
+        if not self.adaptive_k:
+            return [doc for doc, _, _ in hits]
+        with metrics.span("rerank"):
+            return self.adaptive_retriever.select([(doc, score) for doc, score, _ in hits])
+
+    def _retrieve(self, question):
+        k = self.adaptive_retriever.max_k if self.adaptive_k else self.k
+        text = self.search_text(question)
+        if self.query_batcher:
+            # Embedding and search spans are recorded per batch by the batcher
+            hits = self.query_batcher.search(text, k=k)
+            if not self.adaptive_k:
+                return [doc for doc, _ in hits]
+            with metrics.span("rerank"):
+                return self.adaptive_retriever.select(hits)
+
+        with metrics.span("query_embed"):
+            vector = self.query_embedder.embed_query(text)
+
+        if not self.adaptive_k:
+            with metrics.span("search"):
+                return [doc for doc, _ in self.search_by_vector(vector, k=self.k)]
+
+        with metrics.span("search"):
+            hits = self.search_by_vector(vector, k=self.adaptive_retriever.max_k)
+        with metrics.span("rerank"):
+            return self.adaptive_retriever.select(hits)
 
     def query(self, question, verbose=True):
         """
@@ -57,7 +409,7 @@ class RAGSystem:
             return "Error: Vector store not built. Run build_vector_store first."
 
         # Retrieve relevant chunks
-        retrieved_docs = self.vector_store.similarity_search(question, k=4)
+        retrieved_docs = self.retrieve(question)
 
         if verbose:
             print(f"\n{'='*60}")
@@ -68,13 +420,12 @@ class RAGSystem:
                 source = doc.metadata.get("source_file", "unknown")
                 page = doc.metadata.get("page", "?")
                 print(f"\n[{i}] Source: {source} (Page {page})")
+                for other in doc.metadata.get("duplicate_sources", [])[1:]:
+                    print(f"    Also in: {other['source_file']} (Page {other['page']})")
                 print(f"    {doc.page_content[:200]}...")
 
-        # Create context from retrieved documents
-        context = "\n\n".join([doc.page_content for doc in retrieved_docs])
-
-        # Simple prompt-based answer (no API needed)
-        answer = self._generate_answer_local(question, context)
+        # Extractive answer from the retrieved documents (no API needed)
+        answer = self._generate_answer_local(question, retrieved_docs)
 
         print(f"\n{'='*60}")
         print(f"Answer: {answer}")
@@ -82,37 +433,46 @@ class RAGSystem:
 
         return answer
 
-    def _generate_answer_local(self, question, context):
-        """Generate answer using simple template (no API calls)."""
+    def _generate_answer_local(self, question, retrieved_docs):
+        """Generate a cited extractive answer on CPU (no API calls)."""
+        answer = self.faq_cache.get_answer(question, retrieved_docs) if self.faq_cache is not None else None
+        if answer is not None:
+            return answer
+        with metrics.span("generate", mode="local"):
+            result = self.answerer.answer(question, retrieved_docs)
+            answer = self.answerer.format_answer(result)
+
         # Clean text to handle encoding issues
         try:
-            context_clean = context.encode('utf-8', errors='ignore').decode('utf-8')
+            answer = answer.encode('utf-8', errors='ignore').decode('utf-8')
         except:
-            context_clean = context
-
-        # For quick start without API, return a template response
-        return f"""Based on the retrieved documents, here's what I found:
-
-{context_clean[:500]}...
-
-[Note: For full AI-powered answers, add an OpenAI API key to enable GPT-powered responses]"""
+            pass
+        if self.faq_cache is not None:
+            self.faq_cache.put_answer(question, retrieved_docs, answer)
+        return answer
 
     def save_vector_store(self, path="./faiss_index"):
         """Save vector store to disk."""
         if self.vector_store:
-            self.vector_store.save_local(path)
+            with self._index_lock.read():
+                self.vector_store.save_local(path)
+                self.lexicon.save(path)
             print(f"Vector store saved to {path}")
 
     def load_vector_store(self, path="./faiss_index"):
         """Load vector store from disk."""
         print(f"Loading vector store from {path}...")
-        self.vector_store = FAISS.load_local(
+        vector_store = FAISS.load_local(
             path,
             self.embeddings,
             allow_dangerous_deserialization=True
         )
-        self.retriever = self.vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 4}
-        )
+        lexicon = Lexicon.load(path)
+        if lexicon is None:
+            # Index saved before lexicons existed; build one from its chunks
+            lexicon = Lexicon()
+            lexicon.add_documents(
+                vector_store.docstore.search(i) for i in vector_store.index_to_docstore_id.values()
+            )
+        self._swap_vector_store(vector_store, lexicon)
         print("Vector store loaded!")
@@ -0,0 +1,179 @@
+"""Coordinator that fans queries out to retrieval shards and merges the hits.
+
+Usage:
+    python shard_coordinator.py --shard http://127.0.0.1:8601 \\
+        --shard http://127.0.0.1:8602 "What are the mentor eligibility requirements?"
+"""
+import argparse
+import json
+import sys
+import io
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from langchain_core.documents import Document
+
+# Fix encoding issues on Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+class ShardCoordinator:
+    """Queries every shard in parallel and merges results by score.
+
+    Scores are raw FAISS L2 distances (lower is better) merged as-is, which
+    is only meaningful if every shard uses the same embedding model and
+    distance metric (no normalization or projection on just some shards).
+    """
+
+    def __init__(self, shard_urls, timeout=2.0, embeddings=None):
+        """
+        Initialize the coordinator.
+
+        Args:
+            shard_urls: Base URLs of the shard servers
+            timeout: Seconds to wait for shards before giving up on them
+            embeddings: Optional embeddings model; if given, the question is
+                embedded once here instead of once per shard (a shard whose
+                lexicon expands the question still re-embeds it)
+        """
+        self.shard_urls = [url.rstrip("/") for url in shard_urls]
+        self.timeout = timeout
+        self.embeddings = embeddings
+        self.last_shard_stats = []
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.shard_urls)))
+
+    def _search_shard(self, url, payload):
+        """POST a search to one shard. Returns (response dict, latency ms)."""
+        start = time.perf_counter()
+        request = urllib.request.Request(
+            f"{url}/search",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read())
+        return body, (time.perf_counter() - start) * 1000
+
+    def similarity_search_with_score(self, question, k=4):
+        """
+        Search all shards and merge their results.
+
+        Slow or failing shards are skipped; their status is recorded in
+        last_shard_stats together with per-shard latency.
+
+        Args:
+            question: User's question
+            k: Number of merged chunks to return
+
+        Returns:
+            List of (Document, score) tuples, best first
+        """
+        # Always send the question so each shard can apply its own lexicon
+        payload = {"k": k, "question": question}
+        if self.embeddings is not None:
+            payload["embedding"] = self.embeddings.embed_query(question)
+
+        started = time.perf_counter()
+        futures = {
+            self._pool.submit(self._search_shard, url, payload): url
+            for url in self.shard_urls
+        }
+        done, not_done = wait(futures, timeout=self.timeout)
+
+        merged = []
+        stats = []
+        for future, url in futures.items():
+            if future in not_done:
+                future.cancel()
+                stats.append({
+                    "shard": url,
+                    "status": "timeout",
+                    "latency_ms": (time.perf_counter() - started) * 1000,
+                    "hits": 0,
+                })
+                continue
+            try:
+                body, latency_ms = future.result()
+            except Exception as e:
+                stats.append({
+                    "shard": url,
+                    "status": "error",
+                    "error": str(e),
+                    "latency_ms": (time.perf_counter() - started) * 1000,
+                    "hits": 0,
+                })
+                continue
+
+            for hit in body["results"]:
+                metadata = dict(hit["metadata"])
+                metadata["shard"] = body.get("shard", url)
+                merged.append((Document(page_content=hit["content"], metadata=metadata), hit["score"]))
+            stats.append({
+                "shard": body.get("shard", url),
+                "url": url,
+                "status": "ok",
+                "latency_ms": latency_ms,
+                "search_ms": body.get("elapsed_ms"),
+                "hits": len(body["results"]),
+            })
+
+        self.last_shard_stats = stats
+        # Raw L2 merge: assumes the same embedding model and metric on every shard
+        merged.sort(key=lambda pair: pair[1])
+        return merged[:k]
+
+    def similarity_search(self, question, k=4):
+        """Drop-in replacement for FAISS.similarity_search across shards."""
+        return [doc for doc, _ in self.similarity_search_with_score(question, k=k)]
+
+    def query(self, question, k=4, verbose=True):
+        """
+        Query all shards and print the merged hits and per-shard latency.
+
+        Returns:
+            List of (Document, score) tuples, best first
+        """
+        hits = self.similarity_search_with_score(question, k=k)
+
+        if verbose:
+            print(f"\n{'='*60}")
+            print(f"Question: {question}")
+            print(f"{'='*60}")
+            print("\nShards:")
+            for stat in self.last_shard_stats:
+                print(f"  {stat['shard']}: {stat['status']} "
+                      f"({stat['latency_ms']:.1f} ms, {stat['hits']} hits)")
+            print(f"\nRetrieved {len(hits)} relevant chunks:")
+            for i, (doc, score) in enumerate(hits, 1):
+                source = doc.metadata.get("source_file", "unknown")
+                page = doc.metadata.get("page", "?")
+                shard = doc.metadata.get("shard", "?")
+                print(f"\n[{i}] [{shard}] Source: {source} (Page {page}) score={score:.4f}")
+                print(f"    {doc.page_content[:200]}...")
+
+        return hits
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query several retrieval shards")
+    parser.add_argument("question", help="Question to ask")
+    parser.add_argument("--shard", action="append", required=True,
+                        help="Shard base URL (repeat for each shard)")
+    parser.add_argument("-k", type=int, default=4, help="Number of merged results")
+    parser.add_argument("--timeout", type=float, default=2.0,
+                        help="Seconds to wait for slow shards")
+    args = parser.parse_args()
+
+    coordinator = ShardCoordinator(args.shard, timeout=args.timeout)
+    try:
+        coordinator.query(args.question, k=args.k)
+    finally:
+        coordinator.close()
+
+
+if __name__ == "__main__":
+    main()
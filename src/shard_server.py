@@ -0,0 +1,176 @@
+"""Retrieval shard worker: serves one FAISS index over localhost HTTP.
+
+Each shard holds one corpus (for example the DoD MPP documents) in its own
+process. A ShardCoordinator fans queries out to the shards and merges the
+results, so no single process has to hold every corpus.
+
+Usage:
+    python shard_server.py --index ../data/faiss_index --name mpp --port 8601
+"""
+import argparse
+import json
+import sys
+import io
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from rag_system import RAGSystem
+from metrics import metrics
+
+# Fix encoding issues on Windows
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+class ShardHandler(BaseHTTPRequestHandler):
+    """HTTP handler exposing /health and /search for a single shard."""
+
+    # Set by ShardServer before serving
+    rag = None
+    shard_name = "shard"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        store = self.rag.vector_store
+        self._send_json(200, {
+            "shard": self.shard_name,
+            "chunks": store.index.ntotal if store else 0,
+        })
+
+    def do_POST(self):
+        if self.path != "/search":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Bad request: {e}"})
+            return
+        if not isinstance(request, dict):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return
+        k = request.get("k", 4)
+        # bool is an int subclass, so reject it explicitly
+        if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+            self._send_json(400, {"error": "'k' must be a positive integer"})
+            return
+        question = request.get("question")
+        embedding = request.get("embedding")
+        if question is not None and not isinstance(question, str):
+            self._send_json(400, {"error": "'question' must be a string"})
+            return
+        if embedding is not None and not isinstance(embedding, list):
+            self._send_json(400, {"error": "'embedding' must be a list of numbers"})
+            return
+
+        start = time.perf_counter()
+        try:
+            if embedding is not None and (not question or self.rag.search_text(question) == question):
+                # Coordinator already embedded the question once for all shards;
+                # reuse it unless this shard's lexicon would expand the question
+                hits = self.rag.search_by_vector(embedding, k=k)
+            elif question:
+                hits = self.rag.similarity_search_with_score(question, k=k)
+            else:
+                self._send_json(400, {"error": "Request needs 'question' or 'embedding'"})
+                return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self._send_json(200, {
+            "shard": self.shard_name,
+            "elapsed_ms": elapsed_ms,
+            "results": [
+                {
+                    "content": doc.page_content,
+                    "metadata": doc.metadata,
+                    "score": float(score),
+                }
+                for doc, score in hits
+            ],
+        })
+
+    def log_message(self, format, *args):
+        # Keep the console quiet; one line per request is too noisy under load
+        pass
+
+
+class ShardServer:
+    """Loads one vector store and serves it over HTTP."""
+
+    def __init__(self, index_path, name="shard", host="127.0.0.1", port=8601, rag=None):
+        """
+        Initialize a shard server.
+
+        Args:
+            index_path: Path of the saved FAISS index for this shard
+            name: Shard name reported to the coordinator
+            host: Interface to bind (localhost by default)
+            port: Port to listen on
+            rag: Optional already-initialized RAGSystem to reuse
+        """
+        self.name = name
+        self.rag = rag or RAGSystem(use_openai=False)
+        if self.rag.vector_store is None:
+            self.rag.load_vector_store(index_path)
+
+        handler = type("BoundShardHandler", (ShardHandler,), {
+            "rag": self.rag,
+            "shard_name": name,
+        })
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        print(f"Shard '{self.name}' serving on {self.url}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve one retrieval shard over HTTP")
+    parser.add_argument("--index", required=True, help="Path to the shard's FAISS index")
+    parser.add_argument("--name", default="shard", help="Shard name")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8601, help="Port to listen on")
+    args = parser.parse_args()
+
+    server = ShardServer(args.index, name=args.name, host=args.host, port=args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nShard '{args.name}' stopped.")
+
+
+if __name__ == "__main__":
+    main()
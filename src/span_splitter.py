@@ -0,0 +1,209 @@
+"""Single-pass, offset-based text splitter.
+
+RecursiveCharacterTextSplitter splits the whole page on each separator in
+turn, re-splitting oversized pieces recursively and copying strings at every
+level; on dense appendix tables with few newlines that is a hot spot.
+SpanSplitter walks each page once: for every chunk it looks back from
+start + chunk_size for the coarsest separator ("\\n\\n", "\\n", " ") with
+str.rfind on the original string, so no intermediate strings are built.
+Chunks are (start, end) spans into the page text and their text is only
+sliced out when read.
+
+Compare against the current splitter:
+    python span_splitter.py ../data/source_documents --synthetic
+"""
+import argparse
+import sys
+import io
+import time
+from langchain_core.documents import Document
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ")
+WHITESPACE = " \t\n\r\f\v"
+
+
+class LazyChunk:
+    """A chunk stored as a span into its page text; text is sliced on access."""
+
+    __slots__ = ("page_text", "start", "end", "metadata")
+
+    def __init__(self, page_text, start, end, metadata):
+        self.page_text = page_text
+        self.start = start
+        self.end = end
+        self.metadata = metadata
+
+    @property
+    def page_content(self):
+        return self.page_text[self.start:self.end]
+
+    def __len__(self):
+        return self.end - self.start
+
+    def to_document(self):
+        """Materialize as a LangChain Document with its own metadata dict."""
+        return Document(page_content=self.page_content, metadata=dict(self.metadata))
+
+
+class SpanSplitter:
+    """Splits text into overlapping chunks as (start, end) offsets in one pass."""
+
+    def __init__(self, chunk_size=1000, chunk_overlap=200, separators=DEFAULT_SEPARATORS):
+        """
+        Initialize the splitter.
+
+        Args:
+            chunk_size: Maximum characters per chunk
+            chunk_overlap: Maximum characters repeated from the previous chunk
+            separators: Break points, coarsest first; a hard cut is used if none fit
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(f"chunk_overlap ({chunk_overlap}) must be smaller than chunk_size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+
+    def _break(self, text, start, limit):
+        """Return (end, separator) for the chunk starting at start, ending by limit."""
+        for sep in self.separators:
+            pos = text.rfind(sep, start + 1, limit + len(sep))
+            if pos > start:
+                return pos, sep
+        return limit, ""
+
+    def _next_origin(self, text, start, end, sep):
+        """
+        Origin of the next chunk: the earliest sep within the overlap window.
+
+        Like the LangChain splitter (keep_separator), the separator counts
+        towards the next chunk's size even though it is trimmed off.
+        """
+        lower = max(start + 1, end - self.chunk_overlap)
+        if not sep:
+            return lower
+        pos = text.find(sep, lower - len(sep), end)
+        return pos if pos != -1 else end
+
+    def split_spans(self, text):
+        """Return chunk (start, end) offsets into text, whitespace-trimmed."""
+        spans = []
+        length = len(text)
+        origin = 0
+        while origin < length:
+            # Skip leading whitespace without copying
+            start = origin
+            while start < length and text[start] in WHITESPACE:
+                start += 1
+            if start >= length:
+                break
+
+            limit = origin + self.chunk_size
+            if limit >= length:
+                end, sep = length, None
+            else:
+                end, sep = self._break(text, start, limit)
+
+            trimmed = end
+            while trimmed > start and text[trimmed - 1] in WHITESPACE:
+                trimmed -= 1
+            if trimmed > start:
+                spans.append((start, trimmed))
+            if sep is None:
+                break
+            origin = max(self._next_origin(text, start, end, sep), start + 1)
+        return spans
+
+    def split_lazy(self, documents):
+        """Split page Documents into LazyChunks that share each page's text."""
+        chunks = []
+        for doc in documents:
+            text = doc.page_content
+            metadata = doc.metadata
+            for start, end in self.split_spans(text):
+                chunks.append(LazyChunk(text, start, end, metadata))
+        return chunks
+
+    def split_documents(self, documents):
+        """Split page Documents into chunk Documents (drop-in for the LangChain splitter)."""
+        return [chunk.to_document() for chunk in self.split_lazy(documents)]
+
+    def split_text(self, text):
+        return [text[start:end] for start, end in self.split_spans(text)]
+
+
+def synthetic_table_page(rows=2000):
+    """A dense, table-like page with almost no newlines, like the appendix tables."""
+    cells = " | ".join(f"Item {i} cost {i * 37 % 1000}.00 allowable FAR 31.205-{i % 50}" for i in range(rows))
+    return Document(page_content=cells, metadata={"source_file": "synthetic", "page": 0})
+
+
+def compare_splitters(documents, chunk_size=1000, chunk_overlap=200, runs=3):
+    """Time the LangChain splitter against SpanSplitter on the same pages."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    recursive = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", " ", ""]
+    )
+    spans = SpanSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    recursive_s, recursive_chunks = best_of(lambda: recursive.split_documents(documents))
+    lazy_s, lazy_chunks = best_of(lambda: spans.split_lazy(documents))
+    span_s, span_chunks = best_of(lambda: spans.split_documents(documents))
+
+    recursive_texts = {doc.page_content for doc in recursive_chunks}
+    identical = sum(1 for doc in span_chunks if doc.page_content in recursive_texts)
+    return {
+        "pages": len(documents),
+        "chars": sum(len(doc.page_content) for doc in documents),
+        "recursive": {"seconds": recursive_s, "chunks": len(recursive_chunks)},
+        "span_lazy": {"seconds": lazy_s, "chunks": len(lazy_chunks)},
+        "span": {"seconds": span_s, "chunks": len(span_chunks)},
+        "identical_chunks": identical,
+        "max_span_chars": max((len(doc.page_content) for doc in span_chunks), default=0),
+    }
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Micro-benchmark SpanSplitter against RecursiveCharacterTextSplitter")
+    parser.add_argument("folders", nargs="*", help="Folders of PDFs to split")
+    parser.add_argument("--synthetic", action="store_true", help="Add a dense synthetic table page")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    suites = {}
+    if args.folders:
+        from pdf_processor import PDFProcessor
+        suites["corpus"] = PDFProcessor().extract_pdfs(args.folders)
+    if args.synthetic or not args.folders:
+        suites["synthetic table"] = [synthetic_table_page()]
+
+    for name, documents in suites.items():
+        r = compare_splitters(documents, args.chunk_size, args.chunk_overlap, args.runs)
+        print(f"\n{name}: {r['pages']} pages, {r['chars']:,} chars")
+        for key, label in (("recursive", "Recursive splitter"), ("span", "Span splitter"),
+                           ("span_lazy", "Span splitter (lazy)")):
+            print(f"  {label:<22} {r[key]['seconds'] * 1000:>9.2f} ms  {r[key]['chunks']:>5} chunks")
+        print(f"  Speedup: {r['recursive']['seconds'] / r['span']['seconds']:.1f}x "
+              f"({r['recursive']['seconds'] / r['span_lazy']['seconds']:.1f}x lazy); "
+              f"{r['identical_chunks']}/{r['span']['chunks']} chunks identical, "
+              f"largest {r['max_span_chars']} chars")
+
+
+if __name__ == "__main__":
+    main()
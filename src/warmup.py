@@ -0,0 +1,171 @@
+"""Start-up warm-up and a precomputed answer cache for frequently asked questions.
+
+The first queries after a deploy pay for lazy initialisation: model weights
+paged in, first-call allocations in torch and FAISS, cold sentence caches.
+warm_up runs those paths once at engine start, then retrieves and answers a
+configurable FAQ list and keeps the results in a FAQCache. Entries carry the
+index version they were computed against; any index change (build, load,
+add, delete) bumps RAGSystem.index_version, so stale entries are never
+served and are recomputed on their next request.
+
+Report warm-up timings and FAQ vs uncached latency:
+    python warmup.py --index ../data/faiss_index
+"""
+import argparse
+import json
+import sys
+import io
+import threading
+import time
+from local_answerer import DEFAULT_QUESTIONS
+from metrics import metrics
+
+# Encodes run at start-up so first-call costs are not paid by a user
+DUMMY_ENCODES = 3
+
+
+def normalize_question(question):
+    return " ".join(question.lower().split())
+
+
+def load_faq_questions(path=None):
+    """FAQ questions from a JSON list or a text file (one per line); defaults to DEFAULT_QUESTIONS."""
+    if not path:
+        return list(DEFAULT_QUESTIONS)
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        return [str(q) for q in json.loads(text)]
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+class FAQCache:
+    """Retrieved chunks and local answers for a fixed set of questions, per index version."""
+
+    def __init__(self, questions):
+        """
+        Initialize the cache.
+
+        Args:
+            questions: The questions worth caching; others are never stored
+        """
+        self.questions = list(questions)
+        self._keys = {normalize_question(q) for q in self.questions}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, question):
+        return normalize_question(question) in self._keys
+
+    def get(self, question, version):
+        """Cached chunks for a question at this index version, or None."""
+        key = normalize_question(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["version"] != version:
+                del self._entries[key]
+                metrics.inc("faq_cache_invalidations")
+                return None
+        metrics.inc("faq_cache_hits")
+        return entry["docs"]
+
+    def put(self, question, version, docs):
+        """Store the chunks retrieved for a FAQ question against an index version."""
+        key = normalize_question(question)
+        if key in self._keys:
+            with self._lock:
+                self._entries[key] = {"version": version, "docs": docs, "answer": None}
+
+    def get_answer(self, question, docs):
+        """Cached local answer if docs are exactly the cached chunks for question."""
+        with self._lock:
+            entry = self._entries.get(normalize_question(question))
+            return entry["answer"] if entry and entry["docs"] is docs else None
+
+    def put_answer(self, question, docs, answer):
+        with self._lock:
+            entry = self._entries.get(normalize_question(question))
+            if entry and entry["docs"] is docs:
+                entry["answer"] = answer
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def warm_up(rag, faq_questions=None, dummy_encodes=DUMMY_ENCODES):
+    """
+    Warm a loaded RAGSystem and precompute answers for the FAQ list.
+
+    Args:
+        rag: RAGSystem with a vector store
+        faq_questions: Questions to precompute (DEFAULT_QUESTIONS if None)
+        dummy_encodes: Query encodes to run before the FAQ pass
+
+    Returns:
+        Dict of phase timings in ms and the number of FAQ entries
+    """
+    questions = DEFAULT_QUESTIONS if faq_questions is None else faq_questions
+    timings = {}
+
+    start = time.perf_counter()
+    for i in range(dummy_encodes):
+        rag.embeddings.embed_query(f"warm-up query {i}")
+    rag.embeddings.embed_documents([f"warm-up passage {i}" for i in range(8)])
+    timings["encode_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    if rag.vector_store:
+        rag.search_by_vector(rag.embeddings.embed_query("warm-up search"), k=1)
+    timings["search_ms"] = (time.perf_counter() - start) * 1000
+
+    rag.faq_cache = FAQCache(questions)
+    start = time.perf_counter()
+    if rag.vector_store:
+        for question in questions:
+            # Stores the chunks and the local answer in the cache
+            rag._generate_answer_local(question, rag.retrieve(question))
+    timings["faq_ms"] = (time.perf_counter() - start) * 1000
+    timings["faq_entries"] = len(rag.faq_cache)
+    return timings
+
+
+def main():
+    # Fix encoding issues on Windows
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description="Time start-up warm-up and FAQ answers")
+    parser.add_argument("--index", default="../data/faiss_index", help="Index location")
+    parser.add_argument("--faq", help="FAQ questions (JSON list or one per line)")
+    args = parser.parse_args()
+
+    from rag_system import RAGSystem
+
+    start = time.perf_counter()
+    rag = RAGSystem(use_openai=False)
+    model_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    rag.load_vector_store(args.index)
+    index_ms = (time.perf_counter() - start) * 1000
+    questions = load_faq_questions(args.faq)
+    timings = warm_up(rag, questions)
+
+    def answer_ms(question):
+        start = time.perf_counter()
+        rag._generate_answer_local(question, rag.retrieve(question))
+        return (time.perf_counter() - start) * 1000
+
+    faq = sorted(answer_ms(q) for q in questions)
+    fresh = sorted(answer_ms(f"{q} in detail") for q in questions)
+
+    print(f"\nModel load {model_ms:.0f} ms, index load {index_ms:.0f} ms, "
+          f"warm-up encodes {timings['encode_ms']:.0f} ms, first search {timings['search_ms']:.1f} ms")
+    print(f"Precomputed {timings['faq_entries']} FAQ answers in {timings['faq_ms']:.0f} ms")
+    print(f"FAQ answer:      median {faq[len(faq) // 2]:.2f} ms")
+    print(f"Uncached answer: median {fresh[len(fresh) // 2]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
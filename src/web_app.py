@@ -1,10 +1,17 @@
 """Streamlit Web Application for DoD MPP RAG System."""
 import streamlit as st
 import os
+from html import escape
 import sys
 from pathlib import Path
 from rag_system import RAGSystem
+from dedup import ChunkDeduplicator
 from pdf_processor import PDFProcessor
+from llm_cache import LLMResponseCache, CachedOpenAIAnswerer
+from metrics import metrics, start_metrics_server
+from profiling import enable_profiling, disable_profiling
+from warmup import load_faq_questions
+from conversation import Conversation
 import tempfile
 
 # Page configuration
@@ -51,15 +58,35 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Queries from concurrent sessions arriving within this window share one
+# embedding call and one FAISS search; set MPP_MICRO_BATCH_MS=0 to disable
+MICRO_BATCH_MS = float(os.environ.get("MPP_MICRO_BATCH_MS", 5)) or None
+
+# Answered at start-up and offered as example questions; MPP_FAQ_FILE points
+# to a JSON list or a text file with one question per line
+FAQ_QUESTIONS = load_faq_questions(os.environ.get("MPP_FAQ_FILE"))
+
+# Messages rendered per rerun; older ones are paged in on request
+HISTORY_PAGE_MESSAGES = int(os.environ.get("MPP_HISTORY_PAGE", 20))
+# Messages kept per session; the oldest are dropped beyond this
+MAX_SESSION_MESSAGES = int(os.environ.get("MPP_MAX_MESSAGES", 200))
+SOURCE_PREVIEW_CHARS = 300
+# Prometheus endpoint port; MPP_METRICS_PORT=off disables the endpoint
+_metrics_port = os.environ.get("MPP_METRICS_PORT", "9464")
+METRICS_PORT = None if _metrics_port.lower() in ("", "off", "none") else int(_metrics_port)
+
+@st.cache_resource
 def initialize_rag_system():
-    """Initialize or load the RAG system."""
+    """Initialize or load the RAG system (one thread-safe instance shared by all sessions)."""
     vector_store_path = "./data/faiss_index"
 
     # Check if vector store exists
     if os.path.exists(vector_store_path):
         st.info("📦 Loading existing vector store...")
-        rag = RAGSystem(use_openai=st.session_state.get('use_openai', False))
+        rag = RAGSystem(use_openai=False, micro_batch_ms=MICRO_BATCH_MS)  # OpenAI is chosen per session
         rag.load_vector_store(vector_store_path)
+        with st.spinner("Warming up..."):
+            rag.warm_up(FAQ_QUESTIONS)
         return rag
     else:
         st.warning("🔨 No vector store found. Building from PDFs...")
@@ -77,19 +104,40 @@ def initialize_rag_system():
             processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
             documents = processor.extract_pdfs([core_docs_path, modules_path])
             chunks = processor.chunk_documents(documents)
+            chunks = ChunkDeduplicator().dedupe(chunks)
 
         # Build vector store
         with st.spinner("Building vector store..."):
-            rag = RAGSystem(use_openai=st.session_state.get('use_openai', False))
+            rag = RAGSystem(use_openai=False, micro_batch_ms=MICRO_BATCH_MS)  # OpenAI is chosen per session
             rag.build_vector_store(chunks)
             os.makedirs(vector_store_path, exist_ok=True)
             rag.save_vector_store(vector_store_path)
 
+        with st.spinner("Warming up..."):
+            rag.warm_up(FAQ_QUESTIONS)
+
         st.success("✅ Vector store built successfully!")
         return rag
 
+@st.cache_resource
+def get_llm_cache():
+    """LLM response cache shared by all sessions of this server."""
+    return LLMResponseCache("./data/llm_cache.sqlite3")
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Expose stage timings on a local Prometheus endpoint (once per server), if the port is free."""
+    if METRICS_PORT is None:
+        return None
+    try:
+        return start_metrics_server(METRICS_PORT)
+    except OSError as e:
+        # Another app or server process already has the port; run without the endpoint
+        print(f"Warning: metrics endpoint not started on port {METRICS_PORT}: {e}")
+        return None
+
 def process_uploaded_files(uploaded_files):
-    """Process uploaded PDF files and add to vector store."""
+    """Extract, chunk and dedupe uploaded PDF files."""
     if not uploaded_files:
         return []
 
@@ -106,11 +154,40 @@ def process_uploaded_files(uploaded_files):
     processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
     documents = processor.extract_pdfs([temp_dir])
     chunks = processor.chunk_documents(documents)
+    chunks = ChunkDeduplicator().dedupe(chunks)
 
     return chunks
 
-def display_chat_message(role, content, sources=None):
-    """Display a chat message with optional sources."""
+def render_sources_html(sources):
+    """Source boxes of an answer, built once when the answer is created."""
+    return "".join(
+        f'<div class="source-box"><strong>[{i}] {escape(str(source["file"]))} '
+        f'(Page {escape(str(source["page"]))})</strong><br>'
+        f'{escape(source["content"][:SOURCE_PREVIEW_CHARS])}...</div>'
+        for i, source in enumerate(sources, 1)
+    )
+
+def append_message(message):
+    """Add a message to the session, dropping the oldest beyond MAX_SESSION_MESSAGES."""
+    messages = st.session_state.messages
+    messages.append(message)
+    if len(messages) > MAX_SESSION_MESSAGES:
+        del messages[:len(messages) - MAX_SESSION_MESSAGES]
+
+def display_history():
+    """Render the latest page of messages, with a button to page in older ones."""
+    messages = st.session_state.messages
+    shown = st.session_state.get("history_shown", HISTORY_PAGE_MESSAGES)
+    hidden = max(0, len(messages) - shown)
+    if hidden:
+        if st.button(f"⬆️ Show {min(hidden, HISTORY_PAGE_MESSAGES)} earlier messages ({hidden} hidden)"):
+            st.session_state.history_shown = shown + HISTORY_PAGE_MESSAGES
+            st.rerun()
+    for message in messages[hidden:]:
+        display_chat_message(message["role"], message["content"], message.get("sources_html"))
+
+def display_chat_message(role, content, sources_html=None):
+    """Display a chat message with its pre-rendered sources."""
     message_class = "user-message" if role == "user" else "assistant-message"
 
     with st.container():
@@ -121,15 +198,9 @@ def display_chat_message(role, content, sources=None):
         else:
             st.markdown(f"**Assistant:** {content}")
 
-            if sources:
+            if sources_html:
                 with st.expander("📄 View Sources"):
-                    for i, source in enumerate(sources, 1):
-                        st.markdown(f"""
-                        <div class="source-box">
-                            <strong>[{i}] {source['file']} (Page {source['page']})</strong><br>
-                            {source['content'][:300]}...
-                        </div>
-                        """, unsafe_allow_html=True)
+                    st.markdown(sources_html, unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -168,15 +239,35 @@ def main():
             if st.button("Process Uploaded Files"):
                 with st.spinner("Processing uploaded PDFs..."):
                     new_chunks = process_uploaded_files(uploaded_files)
-                    if new_chunks and 'rag_system' in st.session_state:
-                        st.session_state.rag_system.build_vector_store(new_chunks)
-                        st.success(f"✅ Added {len(new_chunks)} chunks from {len(uploaded_files)} files")
+                    if new_chunks and st.session_state.get('rag_system'):
+                        # The RAGSystem is shared by every session, so uploads go
+                        # into a store only this session searches
+                        st.session_state.upload_store = st.session_state.rag_system.build_overlay_store(
+                            new_chunks, st.session_state.get('upload_store')
+                        )
+                        st.success(f"✅ Added {len(new_chunks)} chunks from {len(uploaded_files)} files (this session only)")
+
+        st.divider()
+
+        # Profiling is process-wide, so only flip it when this checkbox changes
+        profiling_on = metrics.profiler is not None
+        profile_queries = st.checkbox("🔬 Profile queries (all sessions)", value=profiling_on)
+        if profile_queries != profiling_on:
+            if profile_queries:
+                enable_profiling("./data/profiles")
+            else:
+                disable_profiling()
+        profiler = metrics.profiler
+        if profiler and st.button("Write profile report"):
+            st.caption(f"🔬 Profile written to {profiler.write_reports()}")
 
         st.divider()
 
         # Clear chat history
         if st.button("🗑️ Clear Chat History"):
             st.session_state.messages = []
+            st.session_state.conversation = Conversation()
+            st.session_state.pop("history_shown", None)
             st.rerun()
 
         st.divider()
@@ -191,14 +282,20 @@ def main():
         **Features:**
         - Semantic search across all documents
         - Source citations for transparency
-        - Upload custom PDFs
+        - Upload custom PDFs (searched in your session only)
         - Optional GPT integration
         """)
 
+    start_metrics_endpoint()
+
     # Initialize session state
     if 'messages' not in st.session_state:
         st.session_state.messages = []
 
+    # Cached query vectors and chunks of recent turns, for follow-up questions
+    if 'conversation' not in st.session_state:
+        st.session_state.conversation = Conversation()
+
     if 'rag_system' not in st.session_state:
         st.session_state.rag_system = initialize_rag_system()
 
@@ -206,27 +303,29 @@ def main():
     if st.session_state.rag_system and st.session_state.use_openai and api_key:
         os.environ["OPENAI_API_KEY"] = api_key
 
-    # Display chat history
-    for message in st.session_state.messages:
-        display_chat_message(
-            message["role"],
-            message["content"],
-            message.get("sources")
-        )
+    # Display chat history (latest page only)
+    display_history()
 
-    # Chat input
+    # Chat input, or an example question clicked on the previous run
     question = st.chat_input("Ask a question about the DoD MPP...")
+    question = question or st.session_state.pop("trigger_question", None)
 
     if question:
         # Add user message
-        st.session_state.messages.append({"role": "user", "content": question})
+        append_message({"role": "user", "content": question})
         display_chat_message("user", question)
 
         # Get answer from RAG system
         if st.session_state.rag_system:
             with st.spinner("Searching documents..."):
                 # Get retrieved documents
-                retrieved_docs = st.session_state.rag_system.vector_store.similarity_search(question, k=4)
+                retrieved_docs = st.session_state.rag_system.retrieve_in_conversation(
+                    question, st.session_state.conversation
+                )
+                if st.session_state.get('upload_store') is not None:
+                    retrieved_docs = st.session_state.rag_system.merge_overlay(
+                        question, retrieved_docs, st.session_state.upload_store
+                    )
 
                 # Prepare sources
                 sources = []
@@ -238,59 +337,41 @@ def main():
                     })
 
                 # Generate answer
-                context = "\n\n".join([doc.page_content for doc in retrieved_docs])
-
                 if st.session_state.use_openai:
-                    # Use OpenAI for better answers
-                    try:
-                        from langchain_openai import ChatOpenAI
-                        from langchain.chains import LLMChain
-                        from langchain.prompts import PromptTemplate
-
-                        llm = ChatOpenAI(model="gpt-4", temperature=0)
-                        prompt = PromptTemplate(
-                            template="""You are a helpful assistant for the DoD Mentor-Protégé Program.
-                            Use the following context to answer the question. Be specific and cite relevant details.
-
-                            Context:
-                            {context}
+                    # Send only the most relevant sentences to the LLM
+                    context = st.session_state.rag_system.compressor.compress(question, retrieved_docs)
 
-                            Question: {question}
-
-                            Answer:""",
-                            input_variables=["context", "question"]
-                        )
-
-                        chain = LLMChain(llm=llm, prompt=prompt)
-                        answer = chain.run(context=context, question=question)
+                    # Use OpenAI for better answers; identical questions over the
+                    # same chunks are served from the shared response cache
+                    try:
+                        answerer = CachedOpenAIAnswerer(get_llm_cache(), model="gpt-4")
+                        with metrics.span("generate", mode="openai"):
+                            answer = answerer.answer(question, context, retrieved_docs)
                     except Exception as e:
                         answer = f"Error using OpenAI: {e}\n\nFalling back to context:\n{context[:500]}..."
                 else:
-                    # Use simple context-based answer
-                    answer = f"""Based on the retrieved documents:\n\n{context[:800]}...\n\n💡 **Tip**: Enable OpenAI in the sidebar for AI-powered comprehensive answers."""
+                    # Use offline extractive answer with citations
+                    answer = st.session_state.rag_system._generate_answer_local(question, retrieved_docs)
+                    answer = f"""{answer}\n\n💡 **Tip**: Enable OpenAI in the sidebar for AI-powered comprehensive answers."""
 
-                # Add assistant message
-                st.session_state.messages.append({
+                # Keep only the rendered sources; the chunk text is not needed again
+                sources_html = render_sources_html(sources)
+                append_message({
                     "role": "assistant",
                     "content": answer,
-                    "sources": sources
+                    "sources_html": sources_html
                 })
 
                 # Display answer
-                display_chat_message("assistant", answer, sources)
+                display_chat_message("assistant", answer, sources_html)
         else:
             st.error("RAG system not initialized. Please check your document folders.")
 
     # Example questions
     if len(st.session_state.messages) == 0:
         st.markdown("### 💭 Try asking:")
-        example_questions = [
-            "What are the eligibility requirements for mentors?",
-            "How do I report financial data?",
-            "What are the roles and responsibilities?",
-            "Tell me about subcontracting requirements",
-            "What is the agreement approval process?"
-        ]
+        # Precomputed at start-up, so these answer instantly
+        example_questions = FAQ_QUESTIONS[:6]
 
         cols = st.columns(2)
         for i, eq in enumerate(example_questions):
@@ -300,11 +381,5 @@ def main():
                     st.session_state.trigger_question = eq
                     st.rerun()
 
-    # Handle triggered example questions
-    if hasattr(st.session_state, 'trigger_question'):
-        question = st.session_state.trigger_question
-        delattr(st.session_state, 'trigger_question')
-        st.rerun()
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from pdf_processor import PDFProcessor
+from span_splitter import SpanSplitter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DIR = os.path.join(ROOT, "data", "source_documents")
+
+
+@pytest.fixture(scope="module")
+def sample_pages():
+    with contextlib.redirect_stdout(io.StringIO()):
+        pages = PDFProcessor().extract_pdfs([SAMPLE_DIR])
+    if not pages:
+        pytest.skip("sample PDFs not available")
+    return pages
+
+
+def test_default_chunks_match_recursive_splitter(sample_pages):
+    reference = RecursiveCharacterTextSplitter(
+        chunk_size=1000, chunk_overlap=200, separators=["\n\n", "\n", " ", ""]
+    ).split_documents(sample_pages)
+    with contextlib.redirect_stdout(io.StringIO()):
+        chunks = PDFProcessor().chunk_documents(sample_pages)
+    assert [(c.page_content, c.metadata) for c in chunks] == [(c.page_content, c.metadata) for c in reference]
+
+
+def test_span_chunks_are_bounded_slices_of_their_page(sample_pages):
+    splitter = SpanSplitter(chunk_size=1000, chunk_overlap=200)
+    for page in sample_pages:
+        for start, end in splitter.split_spans(page.page_content):
+            assert 0 < end - start <= 1000
+            assert page.page_content[start:end].strip()
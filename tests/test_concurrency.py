@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrency import BatchingEmbedder, RWLock
+
+
+class SlowEmbeddings:
+    """Encodes "question N" as [N, batch size] after a short delay."""
+
+    def __init__(self, delay=0.002):
+        self.delay = delay
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [[float(text.split()[-1]), float(len(texts))] for text in texts]
+
+
+def test_concurrent_callers_get_their_own_vectors():
+    embeddings = SlowEmbeddings()
+    embedder = BatchingEmbedder(embeddings, max_batch_size=8)
+    wrong = []
+
+    def client(i):
+        for j in range(40):
+            n = i * 1000 + j
+            if embedder.embed_query(f"question {n}")[0] != n:
+                wrong.append(n)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert wrong == []
+    # Questions were actually batched, and no one was left leading
+    assert embeddings.calls < 16 * 40
+    assert not embedder._running and not embedder._pending
+
+
+def test_leader_returns_once_its_own_question_is_done():
+    embeddings = SlowEmbeddings(delay=0.01)
+    embedder = BatchingEmbedder(embeddings, max_batch_size=1)
+    stop = threading.Event()
+    done = threading.Event()
+
+    def background():
+        while not stop.is_set():
+            embedder.embed_query("question 1")
+
+    # The first caller leads; the others then keep the queue non-empty. A
+    # leader that drained until the queue emptied would never come back
+    leader = threading.Thread(target=lambda: (embedder.embed_query("question 7"), done.set()))
+    leader.start()
+    time.sleep(0.002)
+    threads = [threading.Thread(target=background) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    try:
+        assert done.wait(timeout=2)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        leader.join()
+
+
+def test_writer_waits_for_readers_and_blocks_new_ones():
+    lock = RWLock()
+    events = []
+    reading = threading.Event()
+    release = threading.Event()
+
+    def reader():
+        with lock.read():
+            reading.set()
+            release.wait()
+            events.append("read done")
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    first = threading.Thread(target=reader)
+    first.start()
+    reading.wait()
+    second = threading.Thread(target=writer)
+    second.start()
+    time.sleep(0.05)
+    assert events == []
+    release.set()
+    first.join()
+    second.join()
+    assert events == ["read done", "write"]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from conversation import Conversation, is_follow_up
+
+
+@pytest.mark.parametrize("question", [
+    "And the semi-annual reports?",
+    "What about for protégés?",
+    "Who approves it?",
+    "How long can they last?",
+    "Why?",
+    "How so?",
+])
+def test_follow_up_cues(question):
+    assert is_follow_up(question)
+
+
+@pytest.mark.parametrize("question", [
+    "What is MPP?",
+    "What is DFARS?",
+    "Who signs the agreement?",
+    "Is there a reimbursement limit?",
+    "When are semi-annual reports due?",
+    "How does a company apply for initial mentor approval?",
+])
+def test_self_contained_short_questions_are_not_follow_ups(question):
+    assert not is_follow_up(question)
+
+
+def test_merge_keeps_each_chunk_once_with_its_best_score():
+    query = np.array([1.0, 0.0], dtype=np.float32)
+    a = Document(id="a", page_content="a")
+    b = Document(id="b", page_content="b")
+    hits = [(a, 0.5, np.array([0.0, 1.0], dtype=np.float32))]
+    candidates = [
+        (Document(id="a", page_content="a"), 9.0, np.array([1.0, 0.0], dtype=np.float32)),
+        (b, 9.0, np.array([-1.0, 0.0], dtype=np.float32)),
+    ]
+    merged = Conversation.merge(query, hits, candidates, k=4)
+    assert [(doc.id, score) for doc, score, _ in merged] == [("a", 0.0), ("b", 4.0)]
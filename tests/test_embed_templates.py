@@ -0,0 +1,42 @@
+import contextlib
+import io
+import os
+import pytest
+from benchmark_embeds import LegacyDesigns, write_synthetic_csv
+from generate_reference_embeds import ReferenceEmbedGenerator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def synthetic_csv(tmp_path):
+    path = tmp_path / "references.csv"
+    write_synthetic_csv(path, 300)
+    return path
+
+
+def test_compiled_templates_match_legacy_byte_for_byte(synthetic_csv, tmp_path):
+    generator = ReferenceEmbedGenerator(str(synthetic_csv), str(tmp_path / "embeds"))
+    refs = generator.read_references()
+    assert {ref.design for ref in refs} == {"A", "B", "C"}
+    legacy = LegacyDesigns()
+    for ref in refs:
+        assert generator.render(ref) == legacy.render(ref), generator.embed_filename(ref)
+
+
+def test_written_files_match_legacy(synthetic_csv, tmp_path):
+    output = tmp_path / "embeds"
+    generator = ReferenceEmbedGenerator(str(synthetic_csv), str(output))
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_all_embeds(workers=2)
+    legacy = LegacyDesigns()
+    expected = {generator.embed_filename(ref): legacy.render(ref) for ref in generator.read_references()}
+    written = {path.name: path.read_text(encoding="utf-8") for path in output.glob("module_*_design_*.html")}
+    assert written == expected
+
+
+def test_repository_mapping_matches_legacy(tmp_path):
+    generator = ReferenceEmbedGenerator(os.path.join(ROOT, "reference_mapping_template.csv"), str(tmp_path))
+    legacy = LegacyDesigns()
+    for ref in generator.read_references():
+        assert generator.render(ref) == legacy.render(ref), generator.embed_filename(ref)
@@ -0,0 +1,72 @@
+import threading
+import time
+import pytest
+from langchain_core.documents import Document
+from llm_cache import CachedOpenAIAnswerer, LLMResponseCache
+from mock_openai_server import start_mock_server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+
+
+def run_concurrently(target, threads=16):
+    results = [None] * threads
+    barrier = threading.Barrier(threads)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return results
+
+
+def test_concurrent_identical_prompts_compute_once(cache):
+    for round_number in range(30):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.002)
+            return f"answer {round_number}"
+
+        results = run_concurrently(lambda: cache.get_or_compute(f"key {round_number}", compute))
+        assert len(calls) == 1
+        assert results == [f"answer {round_number}"] * 16
+    assert cache.misses == 30
+    assert cache.hits == 30 * 15
+
+
+def test_failed_compute_is_not_cached(cache):
+    def fail():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("key", fail)
+    assert cache.get_or_compute("key", lambda: "recovered") == "recovered"
+
+
+def test_single_flight_sends_one_request_to_the_mock_server(cache, monkeypatch):
+    pytest.importorskip("langchain_openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    server = start_mock_server(port=0, delay=0.2)
+    try:
+        answerer = CachedOpenAIAnswerer(
+            cache, model="mock", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1"
+        )
+        docs = [Document(id="chunk-1", page_content="Mentors must be approved.")]
+        answers = run_concurrently(
+            lambda: answerer.answer("Who approves mentors?", "Mentors must be approved.", docs), threads=8
+        )
+        # Asked again once the first request has finished: served from the cache
+        answers.append(answerer.answer("Who approves mentors?", "Mentors must be approved.", docs))
+        assert server.RequestHandlerClass.request_count == 1
+        assert len(set(answers)) == 1
+    finally:
+        server.shutdown()
@@ -0,0 +1,79 @@
+import threading
+import time
+import numpy as np
+from langchain_core.documents import Document
+from metrics import metrics
+from query_batcher import QueryBatcher
+
+
+class FakeRAG:
+    """Embeds "question N" as [N, 0] and returns one hit naming the query it was searched with."""
+
+    def __init__(self):
+        self.embeddings = self
+        self.searches = 0
+
+    def embed_documents(self, texts):
+        time.sleep(0.002)
+        return [[float(text.split()[-1]), 0.0] for text in texts]
+
+    def search_batch(self, vectors, k=4):
+        self.searches += 1
+        return [[(Document(page_content=str(int(v[0]))), 0.0)] * k for v in vectors]
+
+    def search_batch_with_vectors(self, vectors, k=4):
+        self.searches += 1
+        return [[(Document(page_content=str(int(v[0]))), 0.0, np.asarray(v))] * k for v in vectors]
+
+
+def test_concurrent_questions_get_their_own_hits():
+    rag = FakeRAG()
+    batcher = QueryBatcher(rag, window_ms=5, max_batch_size=16)
+    metrics.reset()
+    wrong = []
+
+    def client(i):
+        for j in range(20):
+            n = i * 1000 + j
+            if i % 2:
+                hits = batcher.search(f"question {n}", k=2)
+            else:
+                # Already embedded queries (conversation turns) share the batches
+                hits = [hit[:2] for hit in batcher.search_with_vectors([float(n), 0.0], k=2)]
+            if len(hits) != 2 or any(doc.page_content != str(n) for doc, _ in hits):
+                wrong.append(n)
+
+    try:
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        batcher.close()
+    assert wrong == []
+    counters = metrics.to_dict()["counters"]
+    assert counters["micro_batched_queries"] == 8 * 20
+    # Under load, searches were grouped rather than run one per question
+    assert rag.searches < 16 * 20
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    rag = FakeRAG()
+    rag.search_batch = lambda vectors, k=4: 1 / 0
+    batcher = QueryBatcher(rag, window_ms=20)
+    errors = []
+
+    def client():
+        try:
+            batcher.search("question 1")
+        except ZeroDivisionError:
+            errors.append(1)
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+    assert errors == [1] * 4